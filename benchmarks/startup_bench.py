@@ -0,0 +1,66 @@
+"""
+Cold start benchmark.
+
+Runs SprocketForge several times in fresh processes with --exit-after-start and
+reports how long it takes until the main menu is idle. Also checks which heavy
+modules got imported just by loading the GUI.
+
+    python benchmarks/startup_bench.py                       # from source
+    python benchmarks/startup_bench.py --exe dist/main.exe   # PyInstaller build
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("numpy", "cv2", "PIL", "matplotlib")
+
+IMPORT_PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import src.sprocketforge.forge
+elapsed = time.perf_counter() - start
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(f"{{elapsed:.4f}}|{{','.join(loaded)}}")
+"""
+
+
+def time_launch(cmd, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def probe_imports():
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=ROOT,
+                         check=True, capture_output=True, text=True).stdout.strip()
+    elapsed, loaded = out.split("|")
+    return float(elapsed), [m for m in loaded.split(",") if m]
+
+def main():
+    parser = argparse.ArgumentParser(description="Time a cold launch of SprocketForge.")
+    parser.add_argument("--exe", help="path to a PyInstaller build instead of running main.py")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.exe:
+        cmd = [os.path.abspath(args.exe), "--exit-after-start"]
+    else:
+        cmd = [sys.executable, "main.py", "--exit-after-start"]
+        elapsed, loaded = probe_imports()
+        print(f"import forge:  {elapsed * 1000:.1f} ms")
+        print(f"heavy modules loaded at startup: {', '.join(loaded) if loaded else 'none'}")
+
+    timings = time_launch(cmd, args.runs)
+    print(f"launch to idle ({args.runs} runs): "
+          f"median {statistics.median(timings) * 1000:.0f} ms, "
+          f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
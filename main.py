@@ -1,5 +1,12 @@
+import multiprocessing
+import sys
 from src.sprocketforge.forge import Core
 
 if __name__ == "__main__":
+    # image optimization uses a process pool, which a frozen build has to opt into
+    multiprocessing.freeze_support()
     app = Core()
+    if "--exit-after-start" in sys.argv:
+        # used by benchmarks/startup_bench.py to time a cold launch
+        app.after_idle(app.destroy)
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,141 @@
+import argparse
+import json
+import numpy as np
+from .blueprint import load_blueprint
+from .geometry import face_normals, get_global_matrices, iter_mesh_instances, transform_points, triangulate_faces
+
+# SETTINGS
+STEEL_DENSITY = 7850.0      # kg/m^3, Sprocket armour is rolled steel
+
+
+def face_means(offsets, values):
+    """Mean of every CSR segment, 0 for empty ones."""
+    counts = np.diff(offsets)
+    segment_ids = np.repeat(np.arange(len(counts)), counts)
+    sums = np.bincount(segment_ids, weights=values, minlength=len(counts))
+    return sums / np.maximum(counts, 1)
+
+
+class VehicleAnalytics:
+    """
+    Per-face areas, thicknesses and enclosed volumes of every structure, computed
+    once per model. summary() only has to combine those arrays, so what-if numbers
+    for a different thickness cost a few array operations.
+    """
+
+    def __init__(self, model):
+        global_matrices = get_global_matrices(model)
+        self.compartments = []
+        compartment_index = {}
+        mesh_thickness = {}
+
+        areas, thicknesses, compartments = [], [], []
+        volumes, volume_compartments = [], []
+
+        for vuid, mesh_id, matrix, _ in iter_mesh_instances(model, global_matrices):
+            mesh = model.mesh(mesh_id)
+            if mesh is None or mesh.face_count == 0:
+                continue
+
+            # mirrored copies count towards the same compartment
+            if vuid not in compartment_index:
+                compartment_index[vuid] = len(self.compartments)
+                bp = model.blueprints[model.objects[vuid].structure_vuid]
+                self.compartments.append({"vuid": vuid, "type": bp.type})
+            comp = compartment_index[vuid]
+
+            if mesh_id not in mesh_thickness:
+                mesh_thickness[mesh_id] = face_means(mesh.thickness_offsets, mesh.face_thickness)
+
+            world = transform_points(matrix, mesh.vertices.astype(np.float64))
+            normals = face_normals(world, mesh.face_offsets, mesh.face_indices)
+            areas.append(np.linalg.norm(normals, axis=1) / 2)
+            thicknesses.append(mesh_thickness[mesh_id])
+            compartments.append(np.full(mesh.face_count, comp))
+
+            # divergence theorem over the fan triangles, exact for closed meshes
+            triangles, _ = triangulate_faces(mesh.face_offsets, mesh.face_indices)
+            v0, v1, v2 = world[triangles[:, 0]], world[triangles[:, 1]], world[triangles[:, 2]]
+            volumes.append(abs(np.einsum("ij,ij->", v0, np.cross(v1, v2))) / 6)
+            volume_compartments.append(comp)
+
+        self.face_area = np.concatenate(areas) if areas else np.zeros(0)
+        self.face_thickness = np.concatenate(thicknesses) if thicknesses else np.zeros(0)
+        self.face_compartment = np.concatenate(compartments) if compartments else np.zeros(0, dtype=np.int64)
+        # instances of one compartment add up (a part and its mirrored copy)
+        self.compartment_volume = np.bincount(np.array(volume_compartments, dtype=np.int64), weights=volumes,
+                                              minlength=len(self.compartments))
+
+    def summary(self, thickness=None):
+        """
+        Totals and per-compartment numbers. thickness (mm) overrides every face,
+        like the File Editor's thickness option would.
+        """
+        face_thickness = self.face_thickness if thickness is None else np.full_like(self.face_area, thickness)
+        armor_volume = self.face_area * face_thickness / 1000
+
+        count = len(self.compartments)
+        comp_area = np.bincount(self.face_compartment, weights=self.face_area, minlength=count)
+        comp_armor = np.bincount(self.face_compartment, weights=armor_volume, minlength=count)
+
+        compartments = []
+        for i, comp in enumerate(self.compartments):
+            compartments.append({
+                **comp,
+                "area": float(comp_area[i]),
+                "armor_volume": float(comp_armor[i]),
+                "armor_mass": float(comp_armor[i] * STEEL_DENSITY),
+                "volume": float(self.compartment_volume[i]),
+            })
+
+        return {
+            "faces": int(len(self.face_area)),
+            "area": float(self.face_area.sum()),
+            "average_thickness": float(armor_volume.sum() * 1000 / max(self.face_area.sum(), 1e-12)),
+            "armor_volume": float(armor_volume.sum()),
+            "armor_mass": float(armor_volume.sum() * STEEL_DENSITY),
+            "hull_volume": float(self.compartment_volume.sum()),
+            "compartments": compartments,
+        }
+
+
+def format_summary(summary, title=""):
+    lines = [title] if title else []
+    lines += [
+        f"Faces: {summary['faces']:,}",
+        f"Armor area: {summary['area']:.2f} m²  (avg. {summary['average_thickness']:.1f} mm)",
+        f"Armor mass: {summary['armor_mass'] / 1000:.2f} t  ({summary['armor_volume']:.3f} m³ steel)",
+        f"Enclosed volume: {summary['hull_volume']:.2f} m³",
+    ]
+    for comp in summary["compartments"]:
+        lines.append(f"  {comp['type']} #{comp['vuid']}: {comp['armor_mass'] / 1000:.2f} t, "
+                     f"{comp['area']:.2f} m², {comp['volume']:.2f} m³")
+    return "\n".join(lines)
+
+def analyze_blueprint(filepath, thickness=None):
+    """Returns (current summary, summary with thickness applied or None)."""
+    analytics = VehicleAnalytics(load_blueprint(filepath))
+    after = analytics.summary(thickness) if thickness is not None else None
+    return analytics.summary(), after
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Armor area, mass and volume of a Sprocket blueprint.")
+    parser.add_argument("blueprint")
+    parser.add_argument("--thickness", type=float, help="also show the numbers with every face set to this (mm)")
+    parser.add_argument("--json", action="store_true", help="print machine readable output")
+    args = parser.parse_args()
+
+    before, after = analyze_blueprint(args.blueprint, args.thickness)
+    if args.json:
+        print(json.dumps({"current": before, "with_thickness": after}, indent=4))
+        return
+
+    print(format_summary(before, "Current"))
+    if after:
+        print()
+        print(format_summary(after, f"With {args.thickness:g} mm everywhere"))
+
+
+if __name__ == "__main__":
+    main()
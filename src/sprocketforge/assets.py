@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# SETTINGS
+ASSET_DIRS = {"decal": "Decals", "paint": "Paint"}
+INDEX_VERSION = 2
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+# CACHE HELPERS
+
+def get_cache_dir():
+    """Per-user folder for SprocketForge caches (never inside the game folder)."""
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = os.path.join(base, "SprocketForge")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def hash_file(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def temp_path_for(path):
+    """
+    Creates a uniquely named empty file next to path and returns its name. Same folder,
+    so os.replace onto path stays atomic, and jobs running at once never share one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    return tmp_path
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def normalize_asset_name(name):
+    """Reduces a blueprint asset reference to a case-insensitive file name."""
+    # blueprints are saved on windows so the path separator can be either
+    return name.strip().replace("\\", "/").rsplit("/", 1)[-1].casefold()
+
+
+# ASSET INDEX
+
+class AssetIndex:
+    """
+    Index of the Decals and Paint folders of one Sprocket directory, stored on disk.
+    Every refresh stats the files (cheap) and only re-hashes the ones whose size or
+    mtime changed, so files edited in place are picked up too.
+    """
+
+    def __init__(self, sprocket_dir):
+        self.sprocket_dir = os.path.abspath(sprocket_dir)
+        self.dirs = {}      # kind -> {"files": {filename: {"size", "mtime", "sha256"}}}
+        self.by_name = {}   # kind -> {normalized name: filename}
+
+    @property
+    def index_path(self):
+        key = hashlib.sha256(self.sprocket_dir.casefold().encode("utf-8")).hexdigest()[:16]
+        return os.path.join(get_cache_dir(), f"asset_index_{key}.json")
+
+    def folder(self, kind):
+        return os.path.join(self.sprocket_dir, ASSET_DIRS[kind])
+
+    def load(self):
+        """Loads the stored index and refreshes any folder that changed since."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get("version") == INDEX_VERSION and stored.get("root") == self.sprocket_dir:
+                self.dirs = stored.get("dirs", {})
+        except (OSError, ValueError):
+            self.dirs = {}
+
+        if self.refresh():
+            self.save()
+        return self
+
+    def refresh(self):
+        """Brings every folder up to date with the disk. Returns True if anything changed."""
+        changed = False
+        for kind in ASSET_DIRS:
+            old_files = self.dirs.get(kind, {}).get("files", {})
+            files = self._scan(self.folder(kind), old_files)
+            # same object for every entry means nothing was added, removed or re-hashed
+            if files.keys() != old_files.keys() or any(files[n] is not old_files[n] for n in files):
+                changed = True
+            self.dirs[kind] = {"files": files}
+
+        self._build_lookups()
+        return changed
+
+    def _scan(self, folder, old_files):
+        files = {}
+        try:
+            it = os.scandir(folder)
+        except OSError:
+            return files
+
+        with it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+                old = old_files.get(entry.name)
+                # only re-hash files that were touched since the last scan
+                if old and old.get("size") == st.st_size and old.get("mtime") == st.st_mtime:
+                    files[entry.name] = old
+                else:
+                    files[entry.name] = {"size": st.st_size, "mtime": st.st_mtime,
+                                         "sha256": hash_file(entry.path)}
+        return files
+
+    def _build_lookups(self):
+        self.by_name = {}
+        for kind, info in self.dirs.items():
+            names = self.by_name.setdefault(kind, {})
+            for filename in sorted(info.get("files", {})):
+                names.setdefault(normalize_asset_name(filename), filename)
+
+    def save(self):
+        payload = {"version": INDEX_VERSION, "root": self.sprocket_dir, "dirs": self.dirs}
+        tmp_path = None
+        try:
+            tmp_path = temp_path_for(self.index_path)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Could not save asset index: {e}")
+        finally:
+            if tmp_path:
+                remove_quietly(tmp_path)
+
+    def resolve(self, kind, name):
+        """Returns the full path of an asset reference or None if it is not on disk."""
+        filename = self.by_name.get(kind, {}).get(normalize_asset_name(name))
+        if filename is None:
+            return None
+        return os.path.join(self.folder(kind), filename)
+
+    def file_hash(self, kind, path):
+        """
+        sha256 of an indexed file, checked against its current size and mtime first
+        so a file edited since the last refresh is hashed again.
+        """
+        meta = self.dirs.get(kind, {}).get("files", {}).get(os.path.basename(path))
+        if meta is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if meta.get("size") != st.st_size or meta.get("mtime") != st.st_mtime:
+            meta.update(size=st.st_size, mtime=st.st_mtime, sha256=hash_file(path))
+        return meta["sha256"]
+
+    def resolve_all(self, kind, names):
+        """
+        Resolves several references at once.
+        Returns ({name: full path}, [missing asset dicts]).
+        """
+        found = {}
+        missing = []
+        for name in names:
+            path = self.resolve(kind, name)
+            if path:
+                found[name] = path
+            else:
+                missing.append({
+                    "kind": kind,
+                    "name": name,
+                    "expected": os.path.join(self.folder(kind), os.path.basename(name.replace("\\", "/"))),
+                })
+        return found, missing
+
+
+_session_indexes = {}
+# packing jobs run on worker threads, one refresh at a time
+_index_lock = threading.Lock()
+
+def get_asset_index(sprocket_dir):
+    """Returns the session's index for a Sprocket folder, refreshing it if the folders changed."""
+    key = os.path.abspath(sprocket_dir)
+    with _index_lock:
+        index = _session_indexes.get(key)
+        if index is None:
+            index = AssetIndex(key).load()
+            _session_indexes[key] = index
+        elif index.refresh():
+            index.save()
+        return index
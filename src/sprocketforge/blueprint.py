@@ -0,0 +1,239 @@
+import itertools
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# SETTINGS
+SESSION_CACHE_MB = 512      # parsed blueprints kept between pages, least recently used go first
+# rough sizes of parsed json, measured with tracemalloc
+JSON_ENTRY_BYTES = 2048     # one object or blueprint entry
+JSON_VALUE_BYTES = 32       # one float in a mesh's vertex list
+JSON_FACE_BYTES = 450       # one (triangle) face dict with its "v" and "t" lists
+IGNORED_STRUCTURE_TYPES = ("decal", "crew", "internal")
+
+
+# RECORDS
+
+class ObjectRecord:
+    __slots__ = ("vuid", "pvuid", "flags", "pos", "rot", "scale", "mirror_vuid",
+                 "structure_vuid", "is_cannon", "raw")
+
+    def __init__(self, raw):
+        tf = raw.get("transform", {})
+        self.vuid = raw["vuid"]
+        self.pvuid = raw.get("pvuid", -1)
+        self.flags = raw.get("flags", 0)
+        self.pos = tf.get("pos", [0, 0, 0])
+        self.rot = tf.get("rot", [0, 0, 0])
+        self.scale = tf.get("scale", [1, 1, 1])
+        self.mirror_vuid = tf.get("mirrorVuid", -1)
+        self.structure_vuid = raw.get("structureBlueprintVuid", -1)
+        self.is_cannon = "cannonBlueprintVuid" in raw
+        self.raw = raw
+
+    @property
+    def is_mirrored(self):
+        """Objects flagged as symmetric that Sprocket mirrors at load time."""
+        return bool(self.flags & 4) and self.mirror_vuid == -1
+
+
+class BlueprintRecord:
+    __slots__ = ("id", "type", "data", "raw")
+
+    def __init__(self, raw):
+        self.id = raw.get("id")
+        self.type = raw.get("type")
+        self.data = raw.get("blueprint", {})
+        self.raw = raw
+
+    @property
+    def body_mesh_vuid(self):
+        return self.data.get("bodyMeshVuid", -1)
+
+
+class MeshRecord:
+    """
+    Mesh stored as NumPy arrays. Faces are polygons of any size, so they are kept
+    CSR style: the corners of face i are face_indices[face_offsets[i]:face_offsets[i + 1]].
+    Thickness lists ("t") get their own offsets since they are not always as long as "v".
+    """
+    __slots__ = ("vuid", "vertices", "face_offsets", "face_indices",
+                 "thickness_offsets", "face_thickness", "raw")
+
+    def __init__(self, raw):
+        # numpy is only needed once geometry is actually used
+        import numpy as np
+
+        mesh = raw["meshData"]["mesh"]
+        faces = mesh.get("faces", [])
+
+        self.vuid = raw["vuid"]
+        self.raw = raw
+        self.vertices = np.array(mesh.get("vertices", []), dtype=np.float32).reshape(-1, 3)
+
+        counts = np.fromiter((len(f["v"]) for f in faces), dtype=np.int64, count=len(faces))
+        self.face_offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.face_indices = np.fromiter(itertools.chain.from_iterable(f["v"] for f in faces),
+                                        dtype=np.int64, count=int(self.face_offsets[-1]))
+
+        t_counts = np.fromiter((len(f.get("t", ())) for f in faces), dtype=np.int64, count=len(faces))
+        self.thickness_offsets = np.concatenate(([0], np.cumsum(t_counts)))
+        self.face_thickness = np.fromiter(itertools.chain.from_iterable(f.get("t", ()) for f in faces),
+                                          dtype=np.float32, count=int(self.thickness_offsets[-1]))
+
+    @property
+    def face_count(self):
+        return len(self.face_offsets) - 1
+
+    @property
+    def face_sizes(self):
+        return self.face_offsets[1:] - self.face_offsets[:-1]
+
+
+# BLUEPRINT MODEL
+
+class Blueprint:
+    """
+    A parsed .blueprint file with the lookups every feature needs built once:
+    objects by vuid, children by pvuid, blueprints by id and type and meshes by vuid.
+    A read_only model frees the json of each mesh once its MeshRecord is built, the
+    json takes several times the memory of the arrays. Merging and repairs need the
+    raw faces, they work on a fresh Blueprint of the json.
+    """
+
+    def __init__(self, data, path=None, read_only=False):
+        self.data = data
+        self.path = path
+        self.read_only = read_only
+
+        self.objects = {}
+        self.children = {}
+        for raw in data.get("objects", []):
+            obj = ObjectRecord(raw)
+            self.objects[obj.vuid] = obj
+            self.children.setdefault(obj.pvuid, []).append(obj.vuid)
+
+        self.blueprints = {}
+        self.blueprints_by_type = {}
+        for raw in data.get("blueprints", []):
+            bp = BlueprintRecord(raw)
+            self.blueprints[bp.id] = bp
+            self.blueprints_by_type.setdefault(bp.type, []).append(bp)
+
+        self.raw_meshes = {m["vuid"]: m for m in data.get("meshes", [])}
+        self._meshes = {}
+
+    def mesh(self, vuid):
+        """MeshRecord for a mesh vuid (built on first use) or None if it does not exist."""
+        if vuid not in self._meshes:
+            raw = self.raw_meshes.get(vuid)
+            mesh = MeshRecord(raw) if raw is not None else None
+            if mesh is not None and self.read_only:
+                mesh.raw = None
+                raw.pop("meshData", None)
+            self._meshes[vuid] = mesh
+        return self._meshes[vuid]
+
+    def estimated_bytes(self):
+        """Rough memory held by the model: built mesh arrays plus the json still kept."""
+        total = (len(self.objects) + len(self.blueprints) + len(self.raw_meshes)) * JSON_ENTRY_BYTES
+        for vuid, raw in self.raw_meshes.items():
+            mesh = self._meshes.get(vuid)
+            if mesh is not None:
+                total += (mesh.vertices.nbytes + mesh.face_offsets.nbytes + mesh.face_indices.nbytes
+                          + mesh.thickness_offsets.nbytes + mesh.face_thickness.nbytes)
+            elif isinstance(raw.get("meshData"), dict):
+                data = raw["meshData"].get("mesh", {})
+                total += len(data.get("vertices", ())) * JSON_VALUE_BYTES + len(data.get("faces", ())) * JSON_FACE_BYTES
+        return total
+
+    def of_type(self, bp_type):
+        return self.blueprints_by_type.get(bp_type, [])
+
+    def structure_mesh_vuid(self, obj):
+        """Body mesh of a structure object, or -1 for objects that carry no visible geometry."""
+        if obj.is_cannon or obj.structure_vuid == -1:
+            return -1
+        bp = self.blueprints.get(obj.structure_vuid)
+        if bp is None or bp.type in IGNORED_STRUCTURE_TYPES:
+            return -1
+        return bp.body_mesh_vuid
+
+    def descendants(self, vuid):
+        """vuid and every object below it in the pvuid hierarchy."""
+        found = []
+        stack = [vuid]
+        while stack:
+            current = stack.pop()
+            found.append(current)
+            stack.extend(self.children.get(current, []))
+        return found
+
+
+# SESSION CACHE
+
+_session_cache = OrderedDict()
+# jobs load blueprints from worker threads
+_cache_lock = threading.Lock()
+
+def file_signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def _trim_locked(limit, keep=None):
+    # sizes are worked out now, models shrink as their meshes are converted
+    sizes = {key: model.estimated_bytes() for key, (_, model) in _session_cache.items()}
+    total = sum(sizes.values())
+    freed = 0
+    for key in list(_session_cache):
+        if total <= limit:
+            break
+        if key == keep:
+            continue
+        del _session_cache[key]
+        total -= sizes[key]
+        freed += sizes[key]
+    return freed
+
+def load_blueprint(path):
+    """
+    Parses a .blueprint file once per session. Later calls return the same model
+    until the file's mtime or size changes. Cached models are read-only (the json of
+    a mesh is freed once it is converted, see Blueprint) and the cache is kept under
+    SESSION_CACHE_MB; the newest model stays even if it is larger on its own.
+    """
+    key = os.path.abspath(path)
+    signature = file_signature(key)
+
+    with _cache_lock:
+        cached = _session_cache.get(key)
+        if cached and cached[0] == signature:
+            _session_cache.move_to_end(key)
+            return cached[1]
+
+    with open(key, 'r', encoding='utf-8') as f:
+        model = Blueprint(json.load(f), path=key, read_only=True)
+
+    with _cache_lock:
+        _session_cache[key] = (signature, model)
+        _session_cache.move_to_end(key)
+        _trim_locked(SESSION_CACHE_MB * 2 ** 20, keep=key)
+    return model
+
+def is_blueprint_cached(path):
+    """True if load_blueprint would return the session's model without parsing the file again."""
+    key = os.path.abspath(path)
+    with _cache_lock:
+        cached = _session_cache.get(key)
+    return cached is not None and cached[0] == file_signature(key)
+
+def blueprint_cache_bytes():
+    """Estimated memory held by the session cache."""
+    with _cache_lock:
+        return sum(model.estimated_bytes() for _, model in _session_cache.values())
+
+def trim_blueprint_cache(limit=0, keep=None):
+    """Drops least recently used models until the cache holds at most limit bytes. Returns the bytes freed."""
+    with _cache_lock:
+        return _trim_locked(limit, None if keep is None else os.path.abspath(keep))
@@ -0,0 +1,62 @@
+import numpy as np
+from .geometry import face_normals, polygon_edges
+from .spatial import weld_vertices
+
+# SETTINGS
+CREASE_ANGLE = 30.0         # degrees between neighbouring face normals
+WELD_TOLERANCE = 1e-4       # metres, vertices closer than this count as one
+
+
+class FeatureEdges:
+    """
+    Edges of a baked model split into the ones that are always drawn (creases,
+    open borders, non-manifold edges) and smooth ones that only matter when they
+    lie on the silhouette of the current view.
+    """
+
+    def __init__(self, vertices, face_offsets, face_indices, crease_angle=CREASE_ANGLE, tolerance=WELD_TOLERANCE):
+        # welding lets faces of separately stored vertices share edges
+        _, welded = weld_vertices(vertices, tolerance)
+
+        normals = face_normals(vertices, face_offsets, face_indices)
+        lengths = np.linalg.norm(normals, axis=1)
+        unit = np.divide(normals, lengths[:, None], out=np.zeros_like(normals), where=lengths[:, None] > 0)
+
+        corners, following, face_ids = polygon_edges(face_offsets, face_indices)
+        a = face_indices[corners]
+        b = face_indices[following]
+        wa, wb = welded[a], welded[b]
+        keep = wa != wb
+        a, b, wa, wb, face_ids = a[keep], b[keep], wa[keep], wb[keep], face_ids[keep]
+
+        edge_keys = np.minimum(wa, wb) * (welded.max() + 1) + np.maximum(wa, wb)
+        order = np.argsort(edge_keys, kind="stable")
+        _, starts, counts = np.unique(edge_keys[order], return_index=True, return_counts=True)
+
+        first = order[starts]
+        self.edges = np.column_stack((a[first], b[first]))
+
+        # manifold edges: compare the normals of the two faces meeting there
+        manifold = counts == 2
+        second = order[np.minimum(starts + 1, len(order) - 1)]
+        n1 = unit[face_ids[first]]
+        n2 = unit[face_ids[second]]
+        cos_angle = np.einsum("ij,ij->i", n1, n2)
+        crease = cos_angle < np.cos(np.radians(crease_angle))
+
+        always = ~manifold | crease
+        self.static_edges = self.edges[always]
+        self.smooth_edges = self.edges[~always]
+        self.smooth_normals = (n1[~always], n2[~always])
+
+    @property
+    def edge_count(self):
+        return len(self.edges)
+
+    def silhouette(self, view_dir):
+        """Smooth edges where one neighbouring face points at the camera and the other away."""
+        n1, n2 = self.smooth_normals
+        return self.smooth_edges[(n1 @ view_dir > 0) != (n2 @ view_dir > 0)]
+
+    def visible_edges(self, view_dir):
+        return np.concatenate((self.static_edges, self.silhouette(view_dir)))
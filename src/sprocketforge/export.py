@@ -0,0 +1,227 @@
+import json
+import os
+import struct
+import numpy as np
+from .blueprint import load_blueprint
+from .geometry import (compose_transform, get_global_matrices, get_mirror_local_matrix, iter_mesh_instances,
+                       transform_points, triangle_counts, triangulate_faces)
+
+# SETTINGS
+CHUNK_ROWS = 65536
+
+# Sprocket (Unity) is left handed, glTF and OBJ are right handed. Flipping Z turns
+# Unity's clockwise front faces into counter clockwise ones, so winding stays as is.
+HANDEDNESS = np.diag([1.0, 1.0, -1.0, 1.0])
+
+GLB_MAGIC = 0x46546C67
+GLB_JSON_CHUNK = 0x4E4F534A
+GLB_BIN_CHUNK = 0x004E4942
+GL_FLOAT = 5126
+GL_UNSIGNED_INT = 5125
+GL_ARRAY_BUFFER = 34962
+GL_ELEMENT_ARRAY_BUFFER = 34963
+
+
+def collect_instances(model):
+    """Mesh placements of the scene plus the meshes they use, each mesh only once."""
+    global_matrices = get_global_matrices(model)
+    instances = []
+    meshes = {}
+    for vuid, mesh_id, matrix, mirrored in iter_mesh_instances(model, global_matrices):
+        mesh = meshes.get(mesh_id) or model.mesh(mesh_id)
+        if mesh is None or len(mesh.vertices) == 0:
+            continue
+        meshes[mesh_id] = mesh
+        instances.append((vuid, mesh_id, matrix, mirrored))
+    return instances, meshes
+
+def write_array(f, array, chunk_rows=CHUNK_ROWS):
+    """Writes an array's raw bytes in slices so no full-size bytes object is ever built."""
+    for start in range(0, len(array), chunk_rows):
+        f.write(memoryview(np.ascontiguousarray(array[start:start + chunk_rows])))
+
+
+# GLB EXPORT
+
+def gltf_matrix(local_matrix):
+    converted = HANDEDNESS @ local_matrix @ HANDEDNESS
+    # glTF matrices are column major
+    return converted.T.flatten().tolist()
+
+def gltf_nodes(model, mesh_index):
+    """
+    Nodes following the pvuid hierarchy with local transforms. World matrices are
+    not used: under a parent with non-uniform scale they contain shear, which glTF
+    does not allow. Mirrored copies sit next to their original under the same parent.
+    Objects without a mesh anywhere below them are left out.
+    Returns (nodes, root node indices).
+    """
+    def mesh_of(obj):
+        return mesh_index.get(model.structure_mesh_vuid(obj))
+
+    needed = set()
+    for vuid, obj in model.objects.items():
+        if mesh_of(obj) is None:
+            continue
+        while vuid in model.objects and vuid not in needed:
+            needed.add(vuid)
+            vuid = model.objects[vuid].pvuid
+
+    nodes = []
+
+    def add_subtree(vuid):
+        obj = model.objects[vuid]
+        mesh = mesh_of(obj)
+        node = {"name": f"object_{vuid}", "matrix": gltf_matrix(compose_transform(obj.pos, obj.rot, obj.scale))}
+        if mesh is not None:
+            node["mesh"] = mesh
+        added = [len(nodes)]
+        nodes.append(node)
+
+        children = []
+        for child in model.children.get(vuid, []):
+            if child in needed:
+                children += add_subtree(child)
+        if children:
+            node["children"] = children
+
+        if mesh is not None and obj.is_mirrored:
+            added.append(len(nodes))
+            nodes.append({"name": f"object_{vuid}_mirrored", "mesh": mesh,
+                          "matrix": gltf_matrix(get_mirror_local_matrix(obj))})
+        return added
+
+    roots = []
+    for vuid, obj in model.objects.items():
+        if vuid in needed and obj.pvuid not in model.objects:
+            roots += add_subtree(vuid)
+    return nodes, roots
+
+def export_glb(model, out_path, chunk_rows=CHUNK_ROWS):
+    """
+    Writes binary glTF. Every Sprocket mesh becomes one glTF mesh and every placement
+    (mirrored copies included) a node pointing at it, so instancing is kept.
+    """
+    _, meshes = collect_instances(model)
+
+    # layout pass: sizes only, buffers are produced while writing
+    buffer_views, accessors, gltf_meshes, mesh_index = [], [], [], {}
+    offset = 0
+    for mesh_id, mesh in meshes.items():
+        tri_count = int(triangle_counts(mesh.face_offsets).sum())
+        if tri_count == 0:
+            continue
+
+        positions = mesh.vertices
+        flipped_min = (positions.min(axis=0) * [1, 1, -1]).tolist()
+        flipped_max = (positions.max(axis=0) * [1, 1, -1]).tolist()
+        pos_min = [min(a, b) for a, b in zip(flipped_min, flipped_max)]
+        pos_max = [max(a, b) for a, b in zip(flipped_min, flipped_max)]
+
+        pos_bytes = len(positions) * 12
+        buffer_views.append({"buffer": 0, "byteOffset": offset, "byteLength": pos_bytes, "target": GL_ARRAY_BUFFER})
+        accessors.append({"bufferView": len(buffer_views) - 1, "componentType": GL_FLOAT, "count": len(positions),
+                          "type": "VEC3", "min": pos_min, "max": pos_max})
+        offset += pos_bytes
+
+        idx_bytes = tri_count * 12
+        buffer_views.append({"buffer": 0, "byteOffset": offset, "byteLength": idx_bytes,
+                             "target": GL_ELEMENT_ARRAY_BUFFER})
+        accessors.append({"bufferView": len(buffer_views) - 1, "componentType": GL_UNSIGNED_INT,
+                          "count": tri_count * 3, "type": "SCALAR"})
+        offset += idx_bytes
+
+        mesh_index[mesh_id] = len(gltf_meshes)
+        gltf_meshes.append({"name": f"mesh_{mesh_id}", "primitives": [
+            {"attributes": {"POSITION": len(accessors) - 2}, "indices": len(accessors) - 1}]})
+
+    nodes, roots = gltf_nodes(model, mesh_index)
+
+    gltf = {
+        "asset": {"version": "2.0", "generator": "SprocketForge"},
+        "scene": 0,
+        "scenes": [{"nodes": roots}],
+        "nodes": nodes,
+        "meshes": gltf_meshes,
+        "accessors": accessors,
+        "bufferViews": buffer_views,
+        "buffers": [{"byteLength": offset}],
+    }
+    json_bytes = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    json_bytes += b" " * (-len(json_bytes) % 4)
+
+    total_length = 12 + 8 + len(json_bytes) + 8 + offset
+    with open(out_path, 'wb') as f:
+        f.write(struct.pack("<III", GLB_MAGIC, 2, total_length))
+        f.write(struct.pack("<II", len(json_bytes), GLB_JSON_CHUNK))
+        f.write(json_bytes)
+        f.write(struct.pack("<II", offset, GLB_BIN_CHUNK))
+
+        for mesh_id in mesh_index:
+            mesh = meshes[mesh_id]
+            for start in range(0, len(mesh.vertices), chunk_rows):
+                chunk = mesh.vertices[start:start + chunk_rows] * np.float32([1, 1, -1])
+                f.write(memoryview(chunk))
+
+            triangles, _ = triangulate_faces(mesh.face_offsets, mesh.face_indices)
+            write_array(f, triangles.astype(np.uint32), chunk_rows)
+
+    return sum("mesh" in node for node in nodes), len(mesh_index)
+
+
+# OBJ EXPORT
+
+def write_obj_faces(f, face_offsets, face_indices, base, chunk_rows=CHUNK_ROWS):
+    """Writes polygons grouped by corner count, one format string per chunk."""
+    sizes = np.diff(face_offsets)
+    starts = face_offsets[:-1]
+    for k in np.unique(sizes):
+        if k < 3:
+            continue
+        face_starts = starts[sizes == k]
+        template = "f" + " %d" * int(k) + "\n"
+        for start in range(0, len(face_starts), chunk_rows):
+            chunk = face_starts[start:start + chunk_rows]
+            rows = face_indices[chunk[:, None] + np.arange(k)] + base
+            f.write((template * len(rows)) % tuple(rows.ravel().tolist()))
+
+def export_obj(model, out_path, chunk_rows=CHUNK_ROWS):
+    """
+    Writes Wavefront OBJ. OBJ has no instancing, so every placement is written as its
+    own object, transformed one chunk of vertices at a time.
+    """
+    instances, meshes = collect_instances(model)
+    vertex_base = 1
+
+    with open(out_path, 'w', encoding='utf-8') as f:
+        f.write("# SprocketForge export\n")
+        for vuid, mesh_id, matrix, mirrored in instances:
+            mesh = meshes[mesh_id]
+            f.write(f"o object_{vuid}{'_mirrored' if mirrored else ''}\ng mesh_{mesh_id}\n")
+
+            converted = HANDEDNESS @ matrix
+            for start in range(0, len(mesh.vertices), chunk_rows):
+                chunk = transform_points(converted, mesh.vertices[start:start + chunk_rows].astype(np.float64))
+                f.write(("v %.6f %.6f %.6f\n" * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+            write_obj_faces(f, mesh.face_offsets, mesh.face_indices, vertex_base, chunk_rows)
+            vertex_base += len(mesh.vertices)
+
+    return len(instances), len(meshes)
+
+
+def export_blueprint(filepath, out_path):
+    """Exports a blueprint's baked geometry, the format is picked from out_path's extension."""
+    try:
+        model = load_blueprint(filepath)
+        ext = os.path.splitext(out_path)[1].lower()
+        if ext == ".glb":
+            instance_count, mesh_count = export_glb(model, out_path)
+        elif ext == ".obj":
+            instance_count, mesh_count = export_obj(model, out_path)
+        else:
+            return False, f"Export Error: unsupported format '{ext}'"
+
+        return True, f"Exported {instance_count} parts ({mesh_count} meshes) to {os.path.basename(out_path)}"
+    except Exception as e:
+        return False, f"Export Error: {str(e)}"
@@ -2,7 +2,9 @@ import os
 import customtkinter as ctk
 from customtkinter import filedialog
 from importlib.metadata import version, PackageNotFoundError
-from .functions import generate_render_frames, edit_blueprint_file, pack_blueprint_for_sharing, generate_era_files
+from .blueprint import file_signature
+from .jobs import JobScheduler
+from .functions import edit_blueprint_file, pack_blueprints_for_sharing, unpack_package, generate_era_files, generate_era_batch, load_era_table
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("dark-blue")
@@ -12,6 +14,53 @@ COLOR_PRIMARY = "#C59102"
 COLOR_HOVER = "#DDB74F"
 COLOR_SLIDER_BG = "#DBC587"
 
+# SETTINGS
+WATCH_MS = 1000     # how often the visualizer's watch mode looks at the file
+
+def job_result(result):
+    """Turns whatever a job handed back into the usual (success, msg) pair."""
+    if result is None:
+        return False, "Cancelled."
+    if isinstance(result, Exception):
+        return False, f"Error: {result}"
+    return result
+
+def job_progress_text(job, done, total, text):
+    counter = f" ({done + 1}/{total})" if total else ""
+    return f"{job.name}: {text}{counter}" if job.name else f"{text}{counter}"
+
+class JobPage:
+    """
+    Mixin for pages that run background jobs: keeps track of them and of the
+    Cancel button. Pages call add_cancel_button() once and start work with
+    start_job(); on_job_progress / on_job_done are the default callbacks.
+    """
+
+    def add_cancel_button(self, parent, **pack_options):
+        self.running_jobs = []
+        self.cancel_button = ctk.CTkButton(parent, command=self.cancel_jobs, text="Cancel", width=80,
+                                           fg_color="#555555", hover_color="#777777", state="disabled")
+        self.cancel_button.pack(side="right", padx=10, **pack_options)
+
+    def start_job(self, work, name, on_done=None, on_progress=None):
+        on_done = on_done or self.on_job_done
+
+        def done(job, result):
+            self.running_jobs.remove(job)
+            if not self.running_jobs:
+                self.cancel_button.configure(state="disabled")
+            on_done(job, result)
+
+        job = self.controller.jobs.submit(work, name=name, on_done=done,
+                                          on_progress=on_progress or self.on_job_progress)
+        self.running_jobs.append(job)
+        self.cancel_button.configure(state="normal")
+        return job
+
+    def cancel_jobs(self):
+        for job in self.running_jobs:
+            job.cancel()
+
 class Core(ctk.CTk):
     def __init__(self, *args, **kwargs): 
         super().__init__(*args, **kwargs)
@@ -28,23 +77,35 @@ class Core(ctk.CTk):
         
         self.frames = {}
 
-        # pages init
-        for F in (MainMenu, FileEditPage, RenderPage, PackPage, EraPage):
-            page_name = F.__name__
-            frame = F(parent=self.container, controller=self)
-            self.frames[page_name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        # blocking file work runs here instead of on the Tk thread
+        self.jobs = JobScheduler(self)
+
+        # pages are only built the first time they are shown
+        self.page_classes = {F.__name__: F for F in (MainMenu, FileEditPage, RenderPage, PackPage, EraPage)}
 
-        self.show_frame("MainMenu")
         self.add_footer()
+        self.show_frame("MainMenu")
+
+    def destroy(self):
+        self.jobs.shutdown()
+        super().destroy()
+
+    def get_frame(self, page_name):
+        if page_name not in self.frames:
+            frame = self.page_classes[page_name](parent=self.container, controller=self)
+            self.frames[page_name] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+        return self.frames[page_name]
 
     def show_frame(self, page_name):
         for frame in self.frames.values():
             if hasattr(frame, "on_leave"):
                 frame.on_leave()
                 
-        frame = self.frames[page_name]
+        frame = self.get_frame(page_name)
         frame.tkraise()
+        # newly built pages are stacked above the footer
+        self.version_label.lift()
     
     def add_footer(self):
         try:
@@ -103,7 +164,7 @@ class MainMenu(ctk.CTkFrame):
         self.era_creator_button.grid(row=4, column=0, padx=40, pady=15)
         self.close_button.grid(row=5, column=0, padx=40, pady=(15, 40))
 
-class FileEditPage(ctk.CTkFrame):
+class FileEditPage(JobPage, ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -122,6 +183,8 @@ class FileEditPage(ctk.CTkFrame):
         self.status_label = ctk.CTkLabel(self.top_bar, text="Select options to edit.")
         self.status_label.pack(side="left", padx=10)
 
+        self.add_cancel_button(self.top_bar, pady=5)
+
         # --- Scrollable Options List ---
         self.options_frame = ctk.CTkScrollableFrame(self, label_text="Modification Options")
         self.options_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
@@ -173,6 +236,60 @@ class FileEditPage(ctk.CTkFrame):
 
         self.toggle_tracks_ui()
 
+        # COMPARTMENT MERGER
+        self.merge_frame = ctk.CTkFrame(self.options_frame)
+        self.merge_frame.pack(fill="x", padx=10, pady=10)
+
+        self.use_merge_var = ctk.BooleanVar(value=False)
+        self.merge_check = ctk.CTkCheckBox(self.merge_frame, text="Merge Compartments",
+                                           variable=self.use_merge_var, command=self.toggle_merge_ui,
+                                           font=("Arial", 14, "bold"), fg_color=COLOR_PRIMARY, hover_color=COLOR_HOVER)
+        self.merge_check.pack(anchor="w", padx=10, pady=10)
+
+        self.merge_content = ctk.CTkFrame(self.merge_frame, fg_color="transparent")
+        self.merge_content.pack(fill="x", padx=20, pady=(0, 10))
+
+        self.merge_entry = ctk.CTkEntry(self.merge_content, placeholder_text="Object ids, e.g. 12, 15, 16", width=350)
+        self.merge_entry.pack(anchor="w", pady=5)
+        ctk.CTkLabel(self.merge_content, text="The first one is kept, the others are merged into it.\n"
+                     "Ids are listed by Armor Analytics below (#id).",
+                     justify="left", text_color="gray").pack(anchor="w")
+
+        self.toggle_merge_ui()
+
+        # MESH CHECK
+        self.check_frame = ctk.CTkFrame(self.options_frame)
+        self.check_frame.pack(fill="x", padx=10, pady=10)
+
+        self.use_repair_var = ctk.BooleanVar(value=False)
+        self.repair_check = ctk.CTkCheckBox(self.check_frame, text="Repair Broken Geometry", variable=self.use_repair_var,
+                                            font=("Arial", 14, "bold"), fg_color=COLOR_PRIMARY, hover_color=COLOR_HOVER)
+        self.repair_check.pack(anchor="w", padx=10, pady=10)
+
+        self.check_button = ctk.CTkButton(self.check_frame, command=self.check_file, text="Check Blueprint",
+                                          fg_color="#555555", hover_color="#777777")
+        self.check_button.pack(anchor="w", padx=20)
+
+        self.check_label = ctk.CTkLabel(self.check_frame, text="Looks for duplicate vertices, faces without area,\n"
+                                        "bad vertex indices and broken thickness lists.",
+                                        font=("Consolas", 12), justify="left", text_color="gray")
+        self.check_label.pack(anchor="w", padx=20, pady=10)
+
+        # ANALYTICS
+        self.stats_frame = ctk.CTkFrame(self.options_frame)
+        self.stats_frame.pack(fill="x", padx=10, pady=10)
+
+        ctk.CTkLabel(self.stats_frame, text="Armor Analytics", font=("Arial", 14, "bold")).pack(anchor="w", padx=10, pady=10)
+
+        self.stats_button = ctk.CTkButton(self.stats_frame, command=self.analyze_file, text="Analyze Blueprint",
+                                          fg_color="#555555", hover_color="#777777")
+        self.stats_button.pack(anchor="w", padx=20)
+
+        self.stats_label = ctk.CTkLabel(self.stats_frame, text="Shows armor area, mass and volume.\n"
+                                        "With the thickness option on, the edited numbers are shown too.",
+                                        font=("Consolas", 12), justify="left", text_color="gray")
+        self.stats_label.pack(anchor="w", padx=20, pady=10)
+
         # --- Apply Button ---
         self.footer_frame = ctk.CTkFrame(self)
         self.footer_frame.grid(row=2, column=0, sticky="ew", padx=20, pady=20)
@@ -200,6 +317,10 @@ class FileEditPage(ctk.CTkFrame):
         state = "normal" if self.use_tracks_var.get() else "disabled"
         self.opt_inv_tracks.configure(state=state)
 
+    def toggle_merge_ui(self):
+        state = "normal" if self.use_merge_var.get() else "disabled"
+        self.merge_entry.configure(state=state)
+
     def set_thick(self, value):
         try:
             x = int(float(value))
@@ -210,10 +331,19 @@ class FileEditPage(ctk.CTkFrame):
 
     def apply_changes(self):
         # sanity check
-        if not (self.use_thickness_var.get() or self.use_tracks_var.get()):
+        if not (self.use_thickness_var.get() or self.use_tracks_var.get() or self.use_merge_var.get()
+                or self.use_repair_var.get()):
             self.status_label.configure(text="No options selected. Nothing to do.")
             return
 
+        merge_vuids = []
+        if self.use_merge_var.get():
+            try:
+                merge_vuids = [int(x) for x in self.merge_entry.get().replace("#", "").split(",") if x.strip()]
+            except ValueError:
+                self.status_label.configure(text="Merge ids must be numbers separated by commas.")
+                return
+
         filepath = ctk.filedialog.askopenfilename(title="Select .blueprint", filetypes=[("Blueprint files", "*.blueprint")])
         if not filepath:
             self.status_label.configure(text="Cancelled.")
@@ -225,12 +355,68 @@ class FileEditPage(ctk.CTkFrame):
             "thickness_val": self.thickval,
             
             "use_tracks": self.use_tracks_var.get(),
-            "invisible_tracks": self.opt_inv_tracks_var.get()
+            "invisible_tracks": self.opt_inv_tracks_var.get(),
+
+            "use_merge": self.use_merge_var.get(),
+            "merge_vuids": merge_vuids,
+
+            "use_repair": self.use_repair_var.get()
         }
 
-        success, msg = edit_blueprint_file(filepath, settings)
+        self.start_job(lambda job: edit_blueprint_file(filepath, settings, job.report, job.cancel_event),
+                       name=os.path.basename(filepath))
+
+    def on_job_progress(self, job, done, total, text):
+        self.status_label.configure(text=job_progress_text(job, done, total, text))
+
+    def on_job_done(self, job, result):
+        success, msg = job_result(result)
         self.status_label.configure(text=msg)
 
+    def check_file(self):
+        filepath = ctk.filedialog.askopenfilename(title="Select .blueprint", filetypes=[("Blueprint files", "*.blueprint")])
+        if not filepath:
+            return
+
+        self.check_label.configure(text="Checking...", text_color="gray")
+
+        def work(job):
+            from .validator import format_report, validate_blueprint_file
+            report = validate_blueprint_file(filepath)
+            if job.cancelled:
+                return None
+            return report["errors"] == 0, format_report(report, os.path.basename(filepath))
+
+        self.start_job(work, name="Mesh check", on_done=self.on_check_done)
+
+    def on_check_done(self, job, result):
+        success, text = job_result(result)
+        self.check_label.configure(text=text, text_color="white" if success else "#FF4444")
+
+    def analyze_file(self):
+        filepath = ctk.filedialog.askopenfilename(title="Select .blueprint", filetypes=[("Blueprint files", "*.blueprint")])
+        if not filepath:
+            return
+
+        thickness = self.thickval if self.use_thickness_var.get() else None
+        self.stats_label.configure(text="Analyzing...", text_color="gray")
+
+        def work(job):
+            from .analytics import analyze_blueprint, format_summary
+            before, after = analyze_blueprint(filepath, thickness)
+            if job.cancelled:
+                return None
+            text = format_summary(before, os.path.basename(filepath))
+            if after:
+                text += "\n\n" + format_summary(after, f"With {thickness} mm everywhere")
+            return True, text
+
+        self.start_job(work, name="Analytics", on_done=self.on_analysis_done)
+
+    def on_analysis_done(self, job, result):
+        success, text = job_result(result)
+        self.stats_label.configure(text=text, text_color="white" if success else "#FF4444")
+
 
 class RenderPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -243,6 +429,14 @@ class RenderPage(ctk.CTkFrame):
         self.animation_id = None
         self.is_playing = False
 
+        # watch state
+        self.filepath = None
+        self.scene = None
+        self.watch_id = None
+        self.watch_job = None
+        self.watch_signature = None
+        self.pending_signature = None
+
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
 
@@ -258,6 +452,10 @@ class RenderPage(ctk.CTkFrame):
                                          fg_color=COLOR_PRIMARY, hover_color=COLOR_HOVER)
         self.load_button.pack(side="left", padx=5)
 
+        self.export_button = ctk.CTkButton(self.controls_frame, command=self.export_model, text="Export 3D Model",
+                                           fg_color="#555555", hover_color="#777777")
+        self.export_button.pack(side="left", padx=5)
+
         self.status_label = ctk.CTkLabel(self.controls_frame, text="Select a file to begin.")
         self.status_label.pack(side="left", padx=10)
 
@@ -278,6 +476,25 @@ class RenderPage(ctk.CTkFrame):
                                          progress_color=COLOR_PRIMARY, fg_color="#555555")
         self.spin_switch.pack(side="left", padx=20, pady=10)
 
+        # applies to the next load
+        self.outline_var = ctk.BooleanVar(value=True)
+        self.outline_switch = ctk.CTkSwitch(self.playback_frame, text="Outline Only", variable=self.outline_var,
+                                            progress_color=COLOR_PRIMARY, fg_color="#555555")
+        self.outline_switch.pack(side="left", padx=(0, 20), pady=10)
+
+        # memory budget of one render, the render is scaled down to fit it
+        self.budget_var = ctk.StringVar(value="2 GB")
+        self.budget_menu = ctk.CTkOptionMenu(self.playback_frame, variable=self.budget_var, width=90,
+                                             values=["1 GB", "2 GB", "4 GB", "8 GB"],
+                                             fg_color="#555555", button_color="#555555", button_hover_color="#777777")
+        self.budget_menu.pack(side="left", padx=(0, 20), pady=10)
+
+        # re-renders the loaded blueprint whenever Sprocket saves it
+        self.watch_var = ctk.BooleanVar(value=False)
+        self.watch_switch = ctk.CTkSwitch(self.playback_frame, text="Watch File", command=self.toggle_watch,
+                                          variable=self.watch_var, progress_color=COLOR_PRIMARY, fg_color="#555555")
+        self.watch_switch.pack(side="left", padx=(0, 20), pady=10)
+
         self.frame_slider = ctk.CTkSlider(self.playback_frame, from_=0, to=1, number_of_steps=1,
                                           command=self.on_slider_drag,
                                           fg_color=COLOR_SLIDER_BG, button_color=COLOR_PRIMARY, 
@@ -294,25 +511,135 @@ class RenderPage(ctk.CTkFrame):
         self.update_idletasks() 
 
         self.stop_animation()
+        self.stop_watching()
 
         try:
-            self.frames = generate_render_frames(filepath, size=800, frames_count=60)
+            # the rendering stack (numpy, cv2, PIL) is only loaded once the visualizer is used
+            from .render import generate_render_frames
+            from .memory import format_bytes
+            from .scene import SceneCache
+
+            self.filepath = filepath
+            self.scene = SceneCache()
+            self.watch_signature = file_signature(filepath)
+            self.frames = generate_render_frames(filepath, size=800, frames_count=60,
+                                                 feature_edges=self.outline_var.get(), memory_budget=self.budget_mb(),
+                                                 scene=self.scene)
             
             if not self.frames:
                 self.status_label.configure(text="Error: No geometry found.")
                 return
 
-            self.status_label.configure(text=f"Loaded: {os.path.basename(filepath)}")
+            status = f"Loaded: {os.path.basename(filepath)} (peak {format_bytes(self.frames.peak_memory)})"
+            if self.frames.notes:
+                status += f"\nReduced to fit memory: {', '.join(self.frames.notes)}"
+            self.status_label.configure(text=status)
             
             count = len(self.frames)
             self.frame_slider.configure(to=count - 1, number_of_steps=count - 1)
             self.frame_slider.set(0)
 
             self.start_animation()
+            self.start_watching()
         except Exception as e:
             self.status_label.configure(text=f"Error: {str(e)}")
             print(e)
 
+    def budget_mb(self):
+        return int(self.budget_var.get().split()[0]) * 1024
+
+    # --- Watch Mode ---
+
+    def toggle_watch(self):
+        if self.watch_var.get():
+            self.start_watching()
+        else:
+            self.stop_watching()
+
+    def start_watching(self):
+        if self.watch_var.get() and self.filepath and self.watch_id is None:
+            self.watch_id = self.after(WATCH_MS, self.poll_file)
+
+    def stop_watching(self):
+        if self.watch_id:
+            self.after_cancel(self.watch_id)
+            self.watch_id = None
+        self.pending_signature = None
+
+    def poll_file(self):
+        self.watch_id = None
+        try:
+            signature = file_signature(self.filepath)
+        except OSError:
+            # some programs replace the file on save, it can be missing for a moment
+            signature = None
+
+        if signature and signature != self.watch_signature and self.watch_job is None:
+            # only reload once the file stopped changing between two polls
+            if signature == self.pending_signature:
+                self.reload_changed(signature)
+            self.pending_signature = signature
+
+        self.start_watching()
+
+    def reload_changed(self, signature):
+        filepath, scene = self.filepath, self.scene
+        feature_edges, budget_mb = self.outline_var.get(), self.budget_mb()
+        self.status_label.configure(text=f"Change detected, updating {os.path.basename(filepath)}...")
+
+        def work(job):
+            from .render import generate_render_frames
+            # frames are drawn as they are shown, so the preview updates right away
+            frames = generate_render_frames(filepath, size=800, frames_count=60, feature_edges=feature_edges,
+                                            memory_budget=budget_mb, scene=scene, lazy=True)
+            return frames, scene.rebaked, len(scene.object_hashes)
+
+        def on_done(job, result):
+            self.watch_job = None
+            if filepath != self.filepath or scene is not self.scene:
+                return
+            self.watch_signature = signature
+            if result is None or isinstance(result, Exception):
+                self.status_label.configure(text=job_result(result)[1])
+                return
+
+            frames, rebaked, total = result
+            if not frames:
+                self.status_label.configure(text="Error: No geometry found.")
+                return
+
+            if self.frames:
+                self.frames.clear()
+            self.frames = frames
+            count = len(frames)
+            self.current_frame_idx %= count
+            self.frame_slider.configure(to=count - 1, number_of_steps=count - 1)
+            self.status_label.configure(text=f"Updated {os.path.basename(filepath)}: {rebaked} of {total} parts rebaked")
+            if not self.is_playing:
+                self.show_current_frame()
+
+        self.watch_job = self.controller.jobs.submit(work, name="Watch", on_done=on_done)
+
+    def export_model(self):
+        filepath = filedialog.askopenfilename(title="Select .blueprint", filetypes=[("Blueprint files", "*.blueprint")])
+        if not filepath:
+            return
+
+        name_only = os.path.splitext(os.path.basename(filepath))[0]
+        out_path = filedialog.asksaveasfilename(title="Export As", initialfile=f"{name_only}.glb", defaultextension=".glb",
+                                                filetypes=[("Binary glTF", "*.glb"), ("Wavefront OBJ", "*.obj")])
+        if not out_path:
+            return
+
+        self.status_label.configure(text=f"Exporting {name_only}...")
+
+        def work(job):
+            from .export import export_blueprint
+            return export_blueprint(filepath, out_path)
+
+        self.controller.jobs.submit(work, name=name_only,
+                                    on_done=lambda job, result: self.status_label.configure(text=job_result(result)[1]))
+
     def start_animation(self):
         if self.auto_spin_var.get():
             self.is_playing = True
@@ -361,11 +688,16 @@ class RenderPage(ctk.CTkFrame):
 
     def on_leave(self):
         self.stop_animation()
+        self.stop_watching()
+        if self.watch_job:
+            self.watch_job.cancel()
+        self.filepath = None
+        self.scene = None
         if self.frames:
             self.frames.clear()
             self.frames = []
 
-class PackPage(ctk.CTkFrame):
+class PackPage(JobPage, ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -384,6 +716,8 @@ class PackPage(ctk.CTkFrame):
         self.status_label = ctk.CTkLabel(self.top_bar, text="Prepare blueprint for sharing.")
         self.status_label.pack(side="left", padx=10)
 
+        self.add_cancel_button(self.top_bar, pady=5)
+
         # --- Main Content Frame ---
         self.main_frame = ctk.CTkFrame(self)
         self.main_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
@@ -421,6 +755,30 @@ class PackPage(ctk.CTkFrame):
                                          state="disabled") 
         self.pack_button.pack(pady=(20, 10))
 
+        self.delta_var = ctk.BooleanVar(value=False)
+        self.delta_check = ctk.CTkCheckBox(self.main_frame, text="Only include changes since a previous package",
+                                           variable=self.delta_var, fg_color=COLOR_PRIMARY, hover_color=COLOR_HOVER)
+        self.delta_check.pack(pady=5)
+
+        self.optimize_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+        self.optimize_frame.pack(pady=5)
+
+        self.optimize_var = ctk.BooleanVar(value=False)
+        self.optimize_check = ctk.CTkCheckBox(self.optimize_frame, text="Optimize images, max size:",
+                                              variable=self.optimize_var, fg_color=COLOR_PRIMARY, hover_color=COLOR_HOVER)
+        self.optimize_check.pack(side="left", padx=5)
+
+        self.max_size_var = ctk.StringVar(value="Original")
+        self.max_size_menu = ctk.CTkOptionMenu(self.optimize_frame, variable=self.max_size_var, width=110,
+                                               values=["Original", "4096", "2048", "1024"],
+                                               fg_color="#555555", button_color="#555555", button_hover_color="#777777")
+        self.max_size_menu.pack(side="left", padx=5)
+
+        self.unpack_button = ctk.CTkButton(self.main_frame, text="Unpack / Apply Package",
+                                           command=self.run_unpacker, width=320,
+                                           fg_color="#555555", hover_color="#777777")
+        self.unpack_button.pack(pady=(15, 5))
+
         self.status_msg = ctk.CTkLabel(self.main_frame, text="", font=("Arial", 13))
         self.status_msg.pack(pady=10)
 
@@ -433,22 +791,57 @@ class PackPage(ctk.CTkFrame):
             self.pack_button.configure(state="normal")
 
     def run_packer(self):
-        blueprint_path = filedialog.askopenfilename(title="Select Blueprint to Pack", 
-                                                   filetypes=[("Blueprint files", "*.blueprint")])
-        if not blueprint_path:
+        blueprint_paths = filedialog.askopenfilenames(title="Select Blueprint(s) to Pack", 
+                                                     filetypes=[("Blueprint files", "*.blueprint")])
+        if not blueprint_paths:
             return
 
+        previous = None
+        if self.delta_var.get():
+            previous = filedialog.askopenfilename(title="Select Previous Package or Manifest",
+                                                  filetypes=[("Packages", "*.zip"), ("Manifests", "*.json")])
+            if not previous:
+                return
+
         self.status_msg.configure(text="Packing... please wait", text_color="white")
-        self.update_idletasks()
-        
-        success, msg = pack_blueprint_for_sharing(blueprint_path, self.sprocket_path)
-        
+
+        max_size = self.max_size_var.get()
+        options = {
+            "previous": previous,
+            "optimize": self.optimize_var.get(),
+            "max_image_size": int(max_size) if max_size.isdigit() else None,
+        }
+        sprocket_path = self.sprocket_path
+        self.start_job(lambda job: pack_blueprints_for_sharing(list(blueprint_paths), sprocket_path,
+                                                              progress=job.report, cancel=job.cancel_event, **options),
+                       name=f"Packing {len(blueprint_paths)} blueprint(s)")
+
+    def run_unpacker(self):
+        package_path = filedialog.askopenfilename(title="Select Package to Unpack", filetypes=[("Packages", "*.zip")])
+        if not package_path:
+            return
+
+        dest_dir = filedialog.askdirectory(title="Select Folder to Unpack Into")
+        if not dest_dir:
+            return
+
+        self.status_msg.configure(text="Unpacking... please wait", text_color="white")
+        self.start_job(lambda job: unpack_package(package_path, dest_dir, job.report, job.cancel_event),
+                       name=f"Unpacking {os.path.basename(package_path)}")
+
+    def on_job_progress(self, job, done, total, text):
+        self.status_msg.configure(text=job_progress_text(job, done, total, text), text_color="white")
+
+    def on_job_done(self, job, result):
+        self.show_result(*job_result(result))
+
+    def show_result(self, success, msg):
         if success:
             self.status_msg.configure(text=msg, text_color="#00FF00")
         else:
             self.status_msg.configure(text=msg, text_color="#FF4444")
 
-class EraPage(ctk.CTkFrame):
+class EraPage(JobPage, ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -469,6 +862,8 @@ class EraPage(ctk.CTkFrame):
         self.status_label = ctk.CTkLabel(self.top_bar, text="Configure your Era then select the Game Folder.")
         self.status_label.pack(side="left", padx=10)
 
+        self.add_cancel_button(self.top_bar)
+
         # --- Main Scroll Area ---
         self.scroll_frame = ctk.CTkScrollableFrame(self, label_text="Custom Era Settings")
         self.scroll_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 10))
@@ -528,6 +923,12 @@ class EraPage(ctk.CTkFrame):
                                          state="disabled") # Disabled until path is chosen
         self.save_button.grid(row=2, column=0, padx=20, pady=10, sticky="ew")
 
+        self.batch_button = ctk.CTkButton(self, text="Generate Eras From Table (.csv / .json)",
+                                          height=35, command=self.save_batch_files,
+                                          fg_color="#555555", hover_color="#777777",
+                                          state="disabled")
+        self.batch_button.grid(row=3, column=0, padx=20, pady=(0, 30), sticky="ew")
+
     def create_section(self, title, fields, section_key):
         frame = ctk.CTkFrame(self.scroll_frame)
         frame.pack(fill="x", padx=10, pady=10)
@@ -547,19 +948,53 @@ class EraPage(ctk.CTkFrame):
             display_path = path if len(path) < 50 else f"...{path[-47:]}"
             self.path_label.configure(text=display_path)
             self.save_button.configure(state="normal")
+            self.batch_button.configure(state="normal")
 
     def save_all_files(self):
         if not self.sprocket_path:
             self.status_label.configure(text="Error: Select game folder first!", text_color="#FF4444")
             return
 
+        data_package = self.get_data_package()
+        sprocket_path = self.sprocket_path
+        self.start_job(lambda job: generate_era_files(data_package, sprocket_path, job.report, job.cancel_event),
+                       name=data_package["era_name"])
+
+    def get_data_package(self):
         data_package = {}
         for key, (entry, default) in self.entries.items():
             val = entry.get()
             data_package[key] = val if val else default
+        return data_package
 
-        success, msg = generate_era_files(data_package, self.sprocket_path)
-        
+    def save_batch_files(self):
+        if not self.sprocket_path:
+            self.status_label.configure(text="Error: Select game folder first!", text_color="#FF4444")
+            return
+
+        table_path = filedialog.askopenfilename(title="Select Era Table",
+                                                filetypes=[("Era tables", "*.csv *.json")])
+        if not table_path:
+            return
+
+        try:
+            table = load_era_table(table_path)
+        except Exception as e:
+            self.status_label.configure(text=f"Error reading table: {e}", text_color="#FF4444")
+            return
+
+        # columns left out of the table fall back to what is filled in on this page
+        base = self.get_data_package()
+        eras = [{**base, **row} for row in table]
+        sprocket_path = self.sprocket_path
+        self.start_job(lambda job: generate_era_batch(eras, sprocket_path, job.report, job.cancel_event),
+                       name=os.path.basename(table_path))
+
+    def on_job_progress(self, job, done, total, text):
+        self.status_label.configure(text=job_progress_text(job, done, total, text), text_color="white")
+
+    def on_job_done(self, job, result):
+        success, msg = job_result(result)
         color = "#00FF00" if success else "#FF4444"
         self.status_label.configure(text=msg, text_color=color)
 
@@ -1,227 +1,29 @@
+import csv
+import hashlib
 import json
-import math
-import numpy as np
-import cv2
-from PIL import Image
 import os
 import zipfile
+from .assets import get_asset_index, hash_file, remove_quietly, temp_path_for
+from .blueprint import Blueprint, load_blueprint
+from .images import optimize_images
 
 # SETTINGS
-TARGET_FACE_COUNT = 15000 
-RENDER_SIZE = 800
-
-# RENDERING MATH
-
-def get_rotation_matrix(rot):
-    safe_rot = rot[:3]
-    if len(safe_rot) < 3:
-        safe_rot += [0] * (3 - len(safe_rot))
-
-    rx, ry, rz = [math.radians(a) for a in safe_rot]
-
-    mat_z = np.array([
-        [math.cos(rz), -math.sin(rz), 0, 0],
-        [math.sin(rz), math.cos(rz), 0, 0],
-        [0, 0, 1, 0],
-        [0, 0, 0, 1]
-    ])
-
-    mat_x = np.array([
-        [1, 0, 0, 0],
-        [0, math.cos(rx), -math.sin(rx), 0],
-        [0, math.sin(rx), math.cos(rx), 0],
-        [0, 0, 0, 1]
-    ])
-
-    mat_y = np.array([
-        [math.cos(ry), 0, math.sin(ry), 0],
-        [0, 1, 0, 0],
-        [-math.sin(ry), 0, math.cos(ry), 0],
-        [0, 0, 0, 1]
-    ])
-
-    return np.dot(mat_y, np.dot(mat_x, mat_z))
-
-def compose_transform(pos, rot, scale):
-    safe_scale = scale[:3]
-    if len(safe_scale) < 3: safe_scale += [1] * (3 - len(safe_scale))
-    
-    mat_s = np.identity(4)
-    mat_s[0,0], mat_s[1,1], mat_s[2,2] = safe_scale
-
-    mat_r = get_rotation_matrix(rot)
-
-    safe_pos = pos[:3]
-    if len(safe_pos) < 3: safe_pos += [0] * (3 - len(safe_pos))
-
-    mat_t = np.identity(4)
-    mat_t[:3, 3] = safe_pos
-
-    return np.dot(mat_t, np.dot(mat_r, mat_s))
-
-def bake_geometry(data):
-    objects = {o["vuid"]: o for o in data.get("objects", [])}
-    blueprints = {b["id"]: b for b in data.get("blueprints", [])}
-    meshes = {m["vuid"]: m for m in data.get("meshes", [])}
-
-    global_matrices = {}
-
-    def get_global_matrix(vuid):
-        if vuid in global_matrices: return global_matrices[vuid]
-        if vuid not in objects: return np.identity(4)
-
-        obj = objects[vuid]
-        
-        tf = obj.get("transform", {})
-        pos = tf.get("pos", [0, 0, 0])
-        rot = tf.get("rot", [0, 0, 0])
-        scale = tf.get("scale", [1, 1, 1])
-        local_mat = compose_transform(pos, rot, scale)
-
-        parent_vuid = obj.get("pvuid", -1)
-        if parent_vuid != -1:
-            parent_mat = get_global_matrix(parent_vuid)
-            global_mat = np.dot(parent_mat, local_mat)
-        else:
-            global_mat = local_mat
-
-        global_matrices[vuid] = global_mat
-        return global_mat
-
-    for vuid in objects:
-        get_global_matrix(vuid)
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+# characters Windows does not allow in file names, the era name ends up in seven of them
+INVALID_NAME_CHARS = '<>:"/\\|?*'
 
-    baked_vertices = []
-    baked_faces = []
-    vertex_offset = 0
-
-    def add_mesh_to_scene(mesh_id, matrix):
-        nonlocal vertex_offset
-        if mesh_id not in meshes: return
-
-        raw_mesh = meshes[mesh_id]["meshData"]["mesh"]
-        verts = raw_mesh["vertices"]
-        faces = raw_mesh["faces"]
-
-        if not verts: return
-        np_verts = np.array(verts).reshape(-1, 3)
-        ones = np.ones((len(np_verts), 1))
-        np_verts_homo = np.hstack((np_verts, ones))
-        transformed_verts = np.dot(matrix, np_verts_homo.T).T[:, :3]
-
-        baked_vertices.extend(transformed_verts.tolist())
-        for f in faces:
-            new_indices = [idx + vertex_offset for idx in f["v"]]
-            baked_faces.append(new_indices)
-        vertex_offset += len(transformed_verts)
-
-    for vuid, obj in objects.items():
-        if "cannonBlueprintVuid" in obj: continue
-        
-        bp_id = obj.get("structureBlueprintVuid", -1)
-        if bp_id == -1 or bp_id not in blueprints: continue
-
-        bp = blueprints[bp_id]
-        if bp.get("type") in ["decal", "crew", "internal"]: continue
-
-        mesh_id = bp.get("blueprint", {}).get("bodyMeshVuid", -1)
-        
-        matrix = global_matrices[vuid]
-        add_mesh_to_scene(mesh_id, matrix)
-
-        flags = obj.get("flags", 0)
-        mirror_vuid = obj.get("transform", {}).get("mirrorVuid", -1)
-
-        if (flags & 4) and mirror_vuid == -1:
-            parent_vuid = obj.get("pvuid", -1)
-            parent_mat = global_matrices.get(parent_vuid, np.identity(4))
-            
-            tf = obj.get("transform", {})
-            pos = tf.get("pos", [0,0,0])
-            rot = tf.get("rot", [0,0,0])
-            scale = tf.get("scale", [1,1,1])
-
-            mirrored_pos = [-pos[0], pos[1], pos[2]]
-            mirrored_rot = [rot[0], -rot[1], -rot[2]]
-            local_mirror_mat = compose_transform(mirrored_pos, mirrored_rot, scale)
-            global_mirror_mat = np.dot(parent_mat, local_mirror_mat)
-            
-            add_mesh_to_scene(mesh_id, global_mirror_mat)
-
-    return np.array(baked_vertices), baked_faces
-
-def generate_render_frames(filepath, size=600, frames_count=60):
-    try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"Error loading file: {e}")
-        return []
-
-    all_vertices, all_faces = bake_geometry(data)
-
-    if len(all_vertices) == 0:
-        return []
-
-    min_vals = np.min(all_vertices, axis=0)
-    max_vals = np.max(all_vertices, axis=0)
-    center = (min_vals + max_vals) / 2
-    dims = max_vals - min_vals
-    max_dim = np.max(dims)
-    if max_dim == 0: max_dim = 1
-    
-    padding = size * 0.2
-    scale_factor = (size - padding) / max_dim
-
-    stride = 1
-    if len(all_faces) > TARGET_FACE_COUNT:
-        stride = int(len(all_faces) / TARGET_FACE_COUNT)
-    optimized_faces = all_faces[::stride]
-
-    pil_frames = []
-
-    for i in range(frames_count):
-        img = np.zeros((size, size, 3), dtype=np.uint8)
-
-        angle = (i / frames_count) * 2 * math.pi
-        
-        cos_a, sin_a = math.cos(angle), math.sin(angle)
-        tilt = math.radians(20)
-        cos_t, sin_t = math.cos(tilt), math.sin(tilt)
-
-        rot_y = np.array([
-            [cos_a, 0, sin_a],
-            [0, 1, 0],
-            [-sin_a, 0, cos_a]
-        ])
-        
-        rot_x = np.array([
-            [1, 0, 0],
-            [0, cos_t, -sin_t],
-            [0, sin_t, cos_t]
-        ])
-        
-        cam_mat = np.dot(rot_x, rot_y)
-
-        v_centered = all_vertices - center
-        v_rotated = np.dot(v_centered, cam_mat.T)
-        
-        sx = (v_rotated[:, 0] * scale_factor) + (size / 2)
-        sy = (size / 2) - (v_rotated[:, 1] * scale_factor) 
-
-        pts_cache = np.column_stack((sx, sy)).astype(np.int32)
-
-        for face in optimized_faces:
-            pts = pts_cache[face]
-            pts = pts.reshape((-1, 1, 2))
-            cv2.polylines(img, [pts], True, (100, 200, 255), 1)
-
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        pil_frames.append(Image.fromarray(img_rgb))
-
-    return pil_frames
 
+class OperationCancelled(Exception):
+    pass
 
+def step(progress, cancel, done, total, text=""):
+    """Reports progress and stops the operation if it was cancelled in the meantime."""
+    if cancel is not None and cancel.is_set():
+        raise OperationCancelled()
+    if progress is not None:
+        progress(done, total, text)
 
 # FILE EDITING FUNCTIONS
 
@@ -239,11 +41,22 @@ def recursive_thickness_update(data, target_thick):
         for item in data:
             recursive_thickness_update(item, target_thick)
 
-def edit_blueprint_file(filepath, settings):
+def edit_blueprint_file(filepath, settings, progress=None, cancel=None):
     try:
+        step(progress, cancel, 0, 3, "Loading blueprint")
+        # edits need a private copy, the session's cached model must stay untouched
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
+        step(progress, cancel, 1, 3, "Applying changes")
+
+        # MESH REPAIR (first, so the other options work on clean meshes)
+        repair_msg = ""
+        if settings.get("use_repair"):
+            from .validator import repair_blueprint
+            changed = repair_blueprint(data)
+            repair_msg = f"\nRepaired {len(changed)} mesh(es)."
+
         # ARMOR THICKNESS
         if settings.get("use_thickness"):
             target_thick = settings.get("thickness_val", 5)
@@ -256,13 +69,15 @@ def edit_blueprint_file(filepath, settings):
             if settings.get("invisible_tracks"):
                 track_guid = "843f3a65-30f6-4180-a719-f3af1e2bacfe"
                 
-                blueprints = data.get("blueprints", [])
-                for bp in blueprints:
-                    if bp.get("type") == "trackBelt":
-                        if "blueprint" not in bp:
-                            bp["blueprint"] = {}
-                        
-                        bp["blueprint"]["segmentID"] = track_guid
+                for bp in Blueprint(data).of_type("trackBelt"):
+                    bp.raw.setdefault("blueprint", {})["segmentID"] = track_guid
+
+        # COMPARTMENT MERGER
+        merge_msg = ""
+        if settings.get("use_merge"):
+            # numpy is only loaded when geometry is touched
+            from .merger import merge_compartments
+            merge_msg = "\n" + merge_compartments(data, settings.get("merge_vuids", []))
 
         base_dir = os.path.dirname(filepath)
         base_name = os.path.basename(filepath)
@@ -271,163 +86,456 @@ def edit_blueprint_file(filepath, settings):
         new_name = f"{name_only} edited{ext}"
         new_path = os.path.join(base_dir, new_name)
 
-        with open(new_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
+        step(progress, cancel, 2, 3, "Saving")
+        tmp_path = temp_path_for(new_path)
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp_path, new_path)
+        finally:
+            remove_quietly(tmp_path)
             
-        return True, f"Saved as: {new_name}"
+        return True, f"Saved as: {new_name}{repair_msg}{merge_msg}"
 
+    except OperationCancelled:
+        return False, "Cancelled."
     except Exception as e:
         return False, f"Error: {str(e)}"
     
 
 # BLUEPRINT SHARING FUNCTIONS
 
-def get_paint(blueprint_data):
+def get_paint(blueprint):
 
-    blueprints = blueprint_data.get("blueprints", [])
-
-    for bp in blueprints:
-        if bp.get("type") == "paintJob":
-            paintjob_url = bp.get("blueprint", {}).get("colourMapUrl")
-            if paintjob_url and not paintjob_url.startswith("http"):
-                return paintjob_url
+    for bp in blueprint.of_type("paintJob"):
+        paintjob_url = bp.data.get("colourMapUrl")
+        if paintjob_url and not paintjob_url.startswith("http"):
+            return paintjob_url
     
     return None
 
 
-def get_blueprint_decals(blueprint_data):
+def get_blueprint_decals(blueprint):
     """
-    Parses blueprint data and returns a unique set of local decal paths.
+    Returns a unique set of local decal paths of a Blueprint model.
     Ignores external https links.
     """
     decals = set()
-    blueprints = blueprint_data.get("blueprints", [])
     
-    for bp in blueprints:
-
-        if bp.get("type") == "decal":
-            image_url = bp.get("blueprint", {}).get("imageURL")
-            if image_url and not image_url.startswith("http"):
-                decals.add(image_url)
+    for bp in blueprint.of_type("decal"):
+        image_url = bp.data.get("imageURL")
+        if image_url and not image_url.startswith("http"):
+            decals.add(image_url)
                 
     return list(decals)
 
-def pack_blueprint_for_sharing(blueprint_path, sprocket_dir):
+def describe_missing_assets(missing):
+    names = ", ".join(os.path.basename(m["name"].replace("\\", "/")) for m in missing)
+    return f"{len(missing)} missing asset(s): {names}"
+
+def collect_package_files(blueprint_paths, sprocket_dir, progress=None, cancel=None):
     """
-    Packs blueprint, decals, and paint.
+    Works out everything that belongs in a package.
+    Returns ({arcname: (source path, sha256)}, [missing asset dicts]).
     """
-    try:
-        with open(blueprint_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        decal_paths = get_blueprint_decals(data)
+    index = get_asset_index(sprocket_dir)
+    files = {}
+    missing = []
+
+    for i, blueprint_path in enumerate(blueprint_paths):
+        step(progress, cancel, i, len(blueprint_paths), f"Reading {os.path.basename(blueprint_path)}")
+        data = load_blueprint(blueprint_path)
+
+        files[f"vehicles/{os.path.basename(blueprint_path)}"] = (blueprint_path, hash_file(blueprint_path))
+
         paint_path = get_paint(data)
-        
-        base_name = os.path.basename(blueprint_path)
-        name_only = os.path.splitext(base_name)[0]
-        zip_name = f"{name_only}_package.zip"
-        zip_path = os.path.join(os.path.dirname(blueprint_path), zip_name)
-        
-        with zipfile.ZipFile(zip_path, 'w') as zipf:
-            # blueprint
-            zipf.write(blueprint_path, arcname=os.path.join("vehicles", base_name))
-            
-            # decals
-            for local_path in decal_paths:
-                
-                full_path = os.path.join(sprocket_dir, "Decals", os.path.basename(local_path))
-                if os.path.exists(full_path):
-                    zipf.write(full_path, arcname=os.path.join("decals", os.path.basename(full_path)))
-                else:
-                    print(f"Missing Decal: {full_path}")
-
-            # paint
-            if paint_path:
-                full_paint_path = os.path.join(sprocket_dir, "Paint", os.path.basename(paint_path))
-                if os.path.exists(full_paint_path):
-                    zipf.write(full_paint_path, arcname=os.path.join("paints", os.path.basename(full_paint_path)))
-                else:
-                    print(f"Missing Paint: {full_paint_path}")
-        
-        return True, f"Created package: {zip_name}"
-        
+        for kind, folder, names in (("decal", "decals", get_blueprint_decals(data)),
+                                    ("paint", "paints", [paint_path] if paint_path else [])):
+            found, not_found = index.resolve_all(kind, names)
+            for full_path in found.values():
+                # checked against the file's size and mtime, the image cache is keyed by it
+                sha = index.file_hash(kind, full_path) or hash_file(full_path)
+                files[f"{folder}/{os.path.basename(full_path)}"] = (full_path, sha)
+            missing += [m for m in not_found if m not in missing]
+
+    return files, missing
+
+def manifest_id(file_hashes):
+    payload = json.dumps(file_hashes, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+def load_package_manifest(path):
+    """Reads the manifest of a package .zip or a standalone manifest .json."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path, 'r') as zipf:
+            if MANIFEST_NAME not in zipf.namelist():
+                raise ValueError(f"{os.path.basename(path)} has no {MANIFEST_NAME} (made with an older version?)")
+            return json.loads(zipf.read(MANIFEST_NAME).decode("utf-8"))
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def optimize_package_images(files, max_image_size=None, progress=None, cancel=None):
+    """Swaps decal and paint sources for optimized copies where those are smaller."""
+    images = {src: sha for arcname, (src, sha) in files.items()
+              if arcname.startswith(("decals/", "paints/")) and src.lower().endswith(IMAGE_EXTENSIONS)}
+    step(progress, cancel, 0, 1, f"Optimizing {len(images)} image(s)")
+    optimized = optimize_images(images, max_size=max_image_size, cancel=cancel)
+    step(progress, cancel, 1, 1, "Optimizing images")
+
+    for arcname, (src, sha) in list(files.items()):
+        if src in optimized:
+            files[arcname] = (optimized[src], hash_file(optimized[src]))
+    return len(optimized)
+
+def pack_blueprints_for_sharing(blueprint_paths, sprocket_dir, zip_path=None, previous=None,
+                                optimize=False, max_image_size=None, progress=None, cancel=None):
+    """
+    Packs several blueprints with their decals and paints into one .zip with a manifest.
+    When `previous` (a package or manifest path) is given only new or changed files are
+    stored and the package can be applied on top of the previous one with unpack_package.
+    With `optimize` the images are re-encoded (and downscaled to max_image_size) first;
+    the user's own files are never modified.
+    """
+    try:
+        files, missing = collect_package_files(blueprint_paths, sprocket_dir, progress, cancel)
+        optimized_count = 0
+        if optimize:
+            optimized_count = optimize_package_images(files, max_image_size, progress, cancel)
+        file_hashes = {arcname: sha for arcname, (_, sha) in files.items()}
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "id": manifest_id(file_hashes),
+            "files": file_hashes,
+            "included": sorted(file_hashes),
+            # what the blueprints reference but was not found, for whoever unpacks it
+            "missing": [{"kind": m["kind"], "name": os.path.basename(m["name"].replace("\\", "/"))}
+                        for m in missing],
+        }
+
+        if previous:
+            old_manifest = load_package_manifest(previous)
+            old_hashes = old_manifest.get("files", {})
+            manifest["base"] = old_manifest.get("id", manifest_id(old_hashes))
+            manifest["included"] = sorted(a for a, sha in file_hashes.items() if old_hashes.get(a) != sha)
+            # with the old hash, so unpack only deletes copies nobody changed since
+            manifest["removed"] = {a: sha for a, sha in sorted(old_hashes.items()) if a not in file_hashes}
+
+        if zip_path is None:
+            first = os.path.splitext(os.path.basename(blueprint_paths[0]))[0]
+            suffix = "delta" if previous else "package"
+            zip_path = os.path.join(os.path.dirname(blueprint_paths[0]), f"{first}_{suffix}.zip")
+        zip_name = os.path.basename(zip_path)
+
+        try:
+            with zipfile.ZipFile(zip_path, 'w') as zipf:
+                for i, arcname in enumerate(manifest["included"]):
+                    step(progress, cancel, i, len(manifest["included"]), f"Packing {arcname}")
+                    zipf.write(files[arcname][0], arcname=arcname)
+                zipf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=4))
+        except OperationCancelled:
+            os.remove(zip_path)
+            raise
+
+        if previous:
+            msg = f"Created delta package: {zip_name} ({len(manifest['included'])} of {len(file_hashes)} files changed)"
+        else:
+            msg = f"Created package: {zip_name}"
+        if optimized_count:
+            msg += f" ({optimized_count} image(s) optimized)"
+        if missing:
+            msg += f" ({describe_missing_assets(missing)})"
+        return True, msg
+
+    except OperationCancelled:
+        return False, "Cancelled."
     except Exception as e:
         return False, f"Packaging error: {str(e)}"
-    
 
-# ERA CREATOR FUNCTIONS
+def pack_blueprint_for_sharing(blueprint_path, sprocket_dir, previous=None):
+    """
+    Packs blueprint, decals, and paint.
+    """
+    return pack_blueprints_for_sharing([blueprint_path], sprocket_dir, previous=previous)
 
-def generate_era_files(data_package, sprocket_path):
+def package_target(dest_dir, arcname):
     """
-    Writes 7 JSON files into the game's StreamingAssets folders.
+    Path an archive name extracts to inside dest_dir, or None if the name could
+    escape it (absolute, "..", backslashes or drive letters as on Windows).
+    """
+    if not arcname or "\\" in arcname or ":" in arcname or arcname.startswith("/"):
+        return None
+    if any(part in ("", ".", "..") for part in arcname.split("/")):
+        return None
+    target = os.path.join(dest_dir, *arcname.split("/"))
+    if not os.path.realpath(target).startswith(os.path.realpath(dest_dir) + os.sep):
+        return None
+    return target
+
+def unpack_package(package_path, dest_dir, progress=None, cancel=None):
+    """
+    Extracts a full or delta package into dest_dir (vehicles/, decals/, paints/).
+    Every extracted file is checked against the manifest and, for delta packages,
+    the files that were left out must already be present with the expected hash.
+    Nothing is written unless all checks pass.
+    Vehicles the delta removes are deleted if they still match the previous package;
+    decals and paints are left in place since other blueprints in dest_dir may use them.
     """
     try:
-        era_name = data_package.get("era_name", "CustomEra")
-        start_date = data_package.get("start_date", "1945.09.03")
+        manifest = load_package_manifest(package_path)
+        file_hashes = manifest.get("files", {})
+        included = set(manifest.get("included", file_hashes))
+        removed = manifest.get("removed", {})
+        if isinstance(removed, list):  # older deltas did not record the hashes
+            removed = dict.fromkeys(removed)
+
+        targets = {}
+        for arcname in set(file_hashes) | included | set(removed):
+            targets[arcname] = package_target(dest_dir, arcname)
+            if targets[arcname] is None:
+                return False, f"Unpack error: unsafe path in manifest: {arcname}"
+
+        for arcname, sha in file_hashes.items():
+            if arcname in included:
+                continue
+            existing = targets[arcname]
+            if not os.path.exists(existing) or hash_file(existing) != sha:
+                return False, f"Unpack error: base file missing or different: {arcname}"
+
+        with zipfile.ZipFile(package_path, 'r') as zipf:
+            contents = {}
+            for i, arcname in enumerate(included):
+                step(progress, cancel, i, len(included), f"Verifying {arcname}")
+                blob = zipf.read(arcname)
+                if hashlib.sha256(blob).hexdigest() != file_hashes.get(arcname):
+                    return False, f"Unpack error: hash mismatch for {arcname}"
+                contents[arcname] = blob
+
+        for arcname, blob in contents.items():
+            target = targets[arcname]
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp_path = temp_path_for(target)
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(blob)
+                os.replace(tmp_path, target)
+            finally:
+                remove_quietly(tmp_path)
+
+        deleted = 0
+        for arcname, sha in removed.items():
+            target = targets[arcname]
+            if sha and arcname.startswith("vehicles/") and os.path.isfile(target) and hash_file(target) == sha:
+                os.remove(target)
+                deleted += 1
+
+        msg = f"Unpacked {len(contents)} file(s), verified {len(file_hashes)}"
+        if deleted:
+            msg += f" (deleted {deleted} vehicle(s) no longer in the package)"
+        if len(removed) > deleted:
+            msg += f" ({len(removed) - deleted} file(s) no longer in the package were left in place)"
+        if manifest.get("missing"):
+            msg += f" (packed without {describe_missing_assets(manifest['missing'])})"
+        return True, msg
+
+    except OperationCancelled:
+        return False, "Cancelled."
+    except Exception as e:
+        return False, f"Unpack error: {str(e)}"
+    
 
-        era_dir = os.path.join(sprocket_path, "Sprocket_Data", "StreamingAssets", "Eras")
-        tech_dir = os.path.join(sprocket_path, "Sprocket_Data", "StreamingAssets", "Technology")
+# ERA CREATOR FUNCTIONS
 
-        os.makedirs(era_dir, exist_ok=True)
-        os.makedirs(tech_dir, exist_ok=True)
+def check_era_name(era_name):
+    """Raises ValueError unless era_name is usable as part of a file name in the game folders."""
+    if not isinstance(era_name, str) or not era_name.strip():
+        raise ValueError("era name is empty")
+    if ".." in era_name or any(c in INVALID_NAME_CHARS or ord(c) < 32 for c in era_name):
+        raise ValueError(f"era name '{era_name}' contains '..' or a character not allowed in file names")
+    if era_name != era_name.strip() or era_name.endswith("."):
+        raise ValueError(f"era name '{era_name}' starts or ends with a space or ends with a dot")
 
-        # CORE ERA FILE
-        era_file_path = os.path.join(era_dir, f"{era_name}.json")
-        era_content = {
+def build_era_files(data_package):
+    """
+    Builds the 7 JSON files of one era without touching the disk.
+    Returns {(folder, filename): content}. Raises on invalid values.
+    """
+    era_name = data_package.get("era_name", "CustomEra")
+    start_date = data_package.get("start_date", "1945.09.03")
+    check_era_name(era_name)
+
+    # CORE ERA FILE
+    era_files = {
+        ("Eras", f"{era_name}.json"): {
             "v": "0.0", "name": era_name, "start": start_date, "playable": True,
             "mediumVehicleMass": float(data_package.get("med_mass")),
             "heavyVehicleMass": float(data_package.get("heavy_mass"))
         }
-        
-        with open(era_file_path, 'w', encoding='utf-8') as f:
-            json.dump(era_content, f, indent=4)
-
-        # TECH FILES
-        tech_files = {
-            f"{era_name}Engine.json": {
-                "v": "0.0", "type": "combustionEngine", "date": start_date,
-                "properties": {
-                    "torqueCoefficient": float(data_package.get("torque_coeff")),
-                    "technologyFactor": float(data_package.get("tech_factor"))
-                }
-            },
-            f"{era_name}Cannon.json": {
-                "v": "0.0", "type": "cannon", "date": start_date,
-                "properties": {
-                    "operatingPressure": float(data_package.get("pressure")),
-                    "penetratorConstant": float(data_package.get("penetrator")),
-                    "calibre": float(data_package.get("calibre")),
-                    "propellantLength": float(data_package.get("propellant")),
-                    "maxSegmentCount": int(data_package.get("max_seg")),
-                    "minSegmentCount": int(data_package.get("min_seg"))
-                }
-            },
-            f"{era_name}TraverseMotor.json": {
-                "v": "0.0", "type": "traverseMotor", "date": start_date,
-                "properties": {
-                    "resistance": float(data_package.get("resistance")),
-                    "maxMotorTorque": float(data_package.get("max_torque")),
-                    "torque": float(data_package.get("run_torque"))
-                }
-            },
-            f"{era_name}Transmission.json": {
-                "v": "0.0", "type": "transmission", "date": start_date,
-                "properties": {"maxGearCount": int(data_package.get("max_gears"))}
-            },
-            f"{era_name}Track.json": {
-                "v": "0.0", "type": "trackAssembly", "date": start_date,
-                "properties": {"rollingResistance": float(data_package.get("track_res"))}
-            },
-            f"{era_name}Armour.json": {
-                "v": "0.0", "type": "armour", "date": start_date, "properties": {}
+    }
+
+    # TECH FILES
+    tech_files = {
+        f"{era_name}Engine.json": {
+            "v": "0.0", "type": "combustionEngine", "date": start_date,
+            "properties": {
+                "torqueCoefficient": float(data_package.get("torque_coeff")),
+                "technologyFactor": float(data_package.get("tech_factor"))
+            }
+        },
+        f"{era_name}Cannon.json": {
+            "v": "0.0", "type": "cannon", "date": start_date,
+            "properties": {
+                "operatingPressure": float(data_package.get("pressure")),
+                "penetratorConstant": float(data_package.get("penetrator")),
+                "calibre": float(data_package.get("calibre")),
+                "propellantLength": float(data_package.get("propellant")),
+                "maxSegmentCount": int(data_package.get("max_seg")),
+                "minSegmentCount": int(data_package.get("min_seg"))
+            }
+        },
+        f"{era_name}TraverseMotor.json": {
+            "v": "0.0", "type": "traverseMotor", "date": start_date,
+            "properties": {
+                "resistance": float(data_package.get("resistance")),
+                "maxMotorTorque": float(data_package.get("max_torque")),
+                "torque": float(data_package.get("run_torque"))
             }
+        },
+        f"{era_name}Transmission.json": {
+            "v": "0.0", "type": "transmission", "date": start_date,
+            "properties": {"maxGearCount": int(data_package.get("max_gears"))}
+        },
+        f"{era_name}Track.json": {
+            "v": "0.0", "type": "trackAssembly", "date": start_date,
+            "properties": {"rollingResistance": float(data_package.get("track_res"))}
+        },
+        f"{era_name}Armour.json": {
+            "v": "0.0", "type": "armour", "date": start_date, "properties": {}
         }
+    }
+
+    for filename, content in tech_files.items():
+        era_files[("Technology", filename)] = content
+    return era_files
+
+def load_era_table(table_path):
+    """Reads era definitions from a .csv (one era per row) or a .json list."""
+    if table_path.lower().endswith(".csv"):
+        with open(table_path, 'r', encoding='utf-8-sig', newline='') as f:
+            return [{k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+                    for row in csv.DictReader(f)]
+
+    with open(table_path, 'r', encoding='utf-8') as f:
+        table = json.load(f)
+    if not isinstance(table, list):
+        raise ValueError("Era table must be a list of era definitions")
+    return table
+
+def write_files_atomic(contents, progress=None, cancel=None):
+    """
+    Writes {path: text} as one set: everything goes to temp files first, then the
+    originals are moved aside and the temp files renamed into place. If any rename
+    fails (a file locked by another program) the files already placed are taken back
+    out and the originals restored. Files whose content hash already matches the
+    disk are skipped. Returns (written, unchanged).
+    """
+    pending = {}
+    unchanged = 0
+    for path, text in contents.items():
+        blob = text.encode("utf-8")
+        if os.path.exists(path) and hash_file(path) == hashlib.sha256(blob).hexdigest():
+            unchanged += 1
+        else:
+            pending[path] = blob
 
-        for filename, content in tech_files.items():
-            full_path = os.path.join(tech_dir, filename)
-            with open(full_path, 'w', encoding='utf-8') as f:
-                json.dump(content, f, indent=4)
+    temp_paths = {}
+    backups = {}
+    placed = []
+    try:
+        for i, (path, blob) in enumerate(pending.items()):
+            step(progress, cancel, i, len(pending), f"Writing {os.path.basename(path)}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # registered before writing, so a half written temp file is cleaned up too
+            temp_paths[path] = temp_path_for(path)
+            with open(temp_paths[path], 'wb') as f:
+                f.write(blob)
+
+        try:
+            for path, tmp_path in temp_paths.items():
+                if os.path.exists(path):
+                    backup = temp_path_for(path)
+                    try:
+                        os.replace(path, backup)
+                    except OSError:
+                        remove_quietly(backup)
+                        raise
+                    backups[path] = backup
+                os.replace(tmp_path, path)
+                placed.append(path)
+        except Exception:
+            for path in placed:
+                remove_quietly(path)
+            for path, backup in backups.items():
+                try:
+                    os.replace(backup, path)
+                except OSError as e:
+                    print(f"Could not restore {path}, the original is kept as {backup}: {e}")
+            raise
+
+        for backup in backups.values():
+            remove_quietly(backup)
+        return len(placed), unchanged
+
+    finally:
+        for tmp_path in temp_paths.values():
+            remove_quietly(tmp_path)
+
+def generate_era_batch(era_table, sprocket_path, progress=None, cancel=None):
+    """
+    Validates every era in the table first and then writes all of their files
+    in one atomic set, skipping files that are already up to date.
+    """
+    try:
+        assets_dir = os.path.join(sprocket_path, "Sprocket_Data", "StreamingAssets")
+
+        contents = {}
+        errors = []
+        # Windows file names ignore case, so "Late" and "late" would overwrite each other
+        seen = {}
+        for row, data_package in enumerate(era_table, start=1):
+            step(progress, cancel, row - 1, len(era_table), "Validating eras")
+            era_name = data_package.get("era_name", "CustomEra")
+            try:
+                era_files = build_era_files(data_package)
+            except (TypeError, ValueError) as e:
+                errors.append(f"row {row} ({era_name}): {e}")
+                continue
+
+            key = era_name.casefold()
+            if key in seen:
+                errors.append(f"row {row} ({era_name}): same era name as row {seen[key]}")
+                continue
+            seen[key] = row
+
+            for (folder, filename), content in era_files.items():
+                contents[os.path.join(assets_dir, folder, filename)] = json.dumps(content, indent=4)
+
+        if errors:
+            return False, f"Export Error: {'; '.join(errors)}"
+
+        written, unchanged = write_files_atomic(contents, progress, cancel)
+        return True, f"Success! {len(era_table)} era(s): {written} file(s) written, {unchanged} unchanged."
+    except OperationCancelled:
+        return False, "Cancelled."
+    except Exception as e:
+        return False, f"Export Error: {str(e)}"
 
+def generate_era_files(data_package, sprocket_path, progress=None, cancel=None):
+    """
+    Writes 7 JSON files into the game's StreamingAssets folders.
+    """
+    success, msg = generate_era_batch([data_package], sprocket_path, progress, cancel)
+    if success:
         return True, f"Success! Files saved to the game files."
-    except Exception as e:
-        return False, f"Export Error: {str(e)}"
\ No newline at end of file
+    return False, msg
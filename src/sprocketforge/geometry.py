@@ -0,0 +1,276 @@
+import itertools
+import math
+import numpy as np
+from .blueprint import Blueprint
+
+# TRANSFORM MATH
+
+def get_rotation_matrix(rot):
+    safe_rot = rot[:3]
+    if len(safe_rot) < 3:
+        safe_rot += [0] * (3 - len(safe_rot))
+
+    rx, ry, rz = [math.radians(a) for a in safe_rot]
+
+    mat_z = np.array([
+        [math.cos(rz), -math.sin(rz), 0, 0],
+        [math.sin(rz), math.cos(rz), 0, 0],
+        [0, 0, 1, 0],
+        [0, 0, 0, 1]
+    ])
+
+    mat_x = np.array([
+        [1, 0, 0, 0],
+        [0, math.cos(rx), -math.sin(rx), 0],
+        [0, math.sin(rx), math.cos(rx), 0],
+        [0, 0, 0, 1]
+    ])
+
+    mat_y = np.array([
+        [math.cos(ry), 0, math.sin(ry), 0],
+        [0, 1, 0, 0],
+        [-math.sin(ry), 0, math.cos(ry), 0],
+        [0, 0, 0, 1]
+    ])
+
+    return np.dot(mat_y, np.dot(mat_x, mat_z))
+
+def compose_transform(pos, rot, scale):
+    safe_scale = scale[:3]
+    if len(safe_scale) < 3: safe_scale += [1] * (3 - len(safe_scale))
+    
+    mat_s = np.identity(4)
+    mat_s[0,0], mat_s[1,1], mat_s[2,2] = safe_scale
+
+    mat_r = get_rotation_matrix(rot)
+
+    safe_pos = pos[:3]
+    if len(safe_pos) < 3: safe_pos += [0] * (3 - len(safe_pos))
+
+    mat_t = np.identity(4)
+    mat_t[:3, 3] = safe_pos
+
+    return np.dot(mat_t, np.dot(mat_r, mat_s))
+
+# SCENE BAKING
+
+def get_global_matrices(model, cache=None):
+    """
+    World matrix of every object. Matrices already in `cache` are reused and
+    the missing ones are added to it, so drop stale entries before calling.
+    """
+    global_matrices = {} if cache is None else cache
+
+    def get_global_matrix(vuid):
+        if vuid in global_matrices: return global_matrices[vuid]
+        if vuid not in model.objects: return np.identity(4)
+
+        obj = model.objects[vuid]
+        local_mat = compose_transform(obj.pos, obj.rot, obj.scale)
+
+        if obj.pvuid != -1:
+            parent_mat = get_global_matrix(obj.pvuid)
+            global_mat = np.dot(parent_mat, local_mat)
+        else:
+            global_mat = local_mat
+
+        global_matrices[vuid] = global_mat
+        return global_mat
+
+    for vuid in model.objects:
+        get_global_matrix(vuid)
+
+    return global_matrices
+
+def get_mirror_local_matrix(obj):
+    """Transform of the mirrored copy of a symmetric part relative to its parent."""
+    pos, rot = obj.pos, obj.rot
+    mirrored_pos = [-pos[0], pos[1], pos[2]]
+    mirrored_rot = [rot[0], -rot[1], -rot[2]]
+    return compose_transform(mirrored_pos, mirrored_rot, obj.scale)
+
+def get_mirror_matrix(obj, global_matrices):
+    parent_mat = global_matrices.get(obj.pvuid, np.identity(4))
+    return np.dot(parent_mat, get_mirror_local_matrix(obj))
+
+def iter_mesh_instances(model, global_matrices, vuids=None):
+    """
+    Yields (object vuid, mesh vuid, world matrix, mirrored) for every visible mesh
+    placement, including the mirrored copies of symmetric parts.
+    """
+    for vuid in (model.objects if vuids is None else vuids):
+        obj = model.objects[vuid]
+        mesh_id = model.structure_mesh_vuid(obj)
+        if mesh_id == -1: continue
+
+        yield vuid, mesh_id, global_matrices[vuid], False
+
+        if obj.is_mirrored:
+            yield vuid, mesh_id, get_mirror_matrix(obj, global_matrices), True
+
+def transform_points(matrix, points):
+    return np.dot(points, matrix[:3, :3].T) + matrix[:3, 3]
+
+def bake_mesh_arrays(model):
+    """
+    Bakes every visible mesh placement into world space.
+    Returns (vertices (N, 3), face_offsets, face_indices) with faces in CSR layout.
+    """
+    if isinstance(model, dict):
+        model = Blueprint(model)
+
+    global_matrices = get_global_matrices(model)
+
+    baked_vertices = []
+    baked_offsets = [np.zeros(1, dtype=np.int64)]
+    baked_indices = []
+    vertex_offset = 0
+    index_offset = 0
+
+    for _, mesh_id, matrix, _ in iter_mesh_instances(model, global_matrices):
+        mesh = model.mesh(mesh_id)
+        if mesh is None or len(mesh.vertices) == 0: continue
+
+        baked_vertices.append(transform_points(matrix, mesh.vertices.astype(np.float64)))
+        baked_offsets.append(mesh.face_offsets[1:] + index_offset)
+        baked_indices.append(mesh.face_indices + vertex_offset)
+        vertex_offset += len(mesh.vertices)
+        index_offset += len(mesh.face_indices)
+
+    if not baked_vertices:
+        return np.zeros((0, 3)), baked_offsets[0], np.zeros(0, dtype=np.int64)
+    return np.concatenate(baked_vertices), np.concatenate(baked_offsets), np.concatenate(baked_indices)
+
+def bake_geometry(model):
+    vertices, face_offsets, face_indices = bake_mesh_arrays(model)
+    if len(vertices) == 0:
+        return vertices, []
+    return vertices, np.split(face_indices, face_offsets[1:-1])
+
+
+# POLYGON HELPERS
+
+def triangle_counts(face_offsets):
+    return np.maximum(np.diff(face_offsets) - 2, 0)
+
+def triangulate_faces(face_offsets, face_indices):
+    """
+    Fan-triangulates CSR polygons. Returns (triangles (T, 3), face id of each triangle).
+    Faces with fewer than 3 corners are dropped.
+    """
+    counts = triangle_counts(face_offsets)
+    face_ids = np.repeat(np.arange(len(counts)), counts)
+
+    # position of every triangle inside its own fan
+    tri_starts = np.cumsum(counts) - counts
+    local = np.arange(len(face_ids)) - np.repeat(tri_starts, counts)
+
+    first = face_offsets[:-1][face_ids]
+    triangles = np.column_stack((
+        face_indices[first],
+        face_indices[first + local + 1],
+        face_indices[first + local + 2],
+    ))
+    return triangles, face_ids
+
+def polygon_edges(face_offsets, face_indices):
+    """Every polygon side as (start corner, end corner, face id), corners being positions in face_indices."""
+    sizes = np.diff(face_offsets)
+    face_ids = np.repeat(np.arange(len(sizes)), sizes)
+
+    corners = np.arange(len(face_indices))
+    following = corners + 1
+    # the last corner of every face wraps around to its first
+    last = face_offsets[1:][sizes > 0] - 1
+    following[last] = face_offsets[:-1][sizes > 0]
+    return corners, following, face_ids
+
+def face_normals(positions, face_offsets, face_indices):
+    """Newell normals of arbitrary polygons, length is twice the polygon area."""
+    corners, following, face_ids = polygon_edges(face_offsets, face_indices)
+    cross = np.cross(positions[face_indices[corners]], positions[face_indices[following]])
+    face_count = len(face_offsets) - 1
+    return np.column_stack([np.bincount(face_ids, weights=cross[:, axis], minlength=face_count)
+                            for axis in range(3)])
+
+
+# CSR MESH EDITING
+
+def raw_vertex_array(raw_mesh):
+    """
+    Vertices of a raw mesh dict (meshData.mesh) as float64. Edits start from these
+    instead of MeshRecord's float32 copy, which would round the values written back.
+    """
+    return np.array(raw_mesh.get("vertices", []), dtype=np.float64).reshape(-1, 3)
+
+def raw_thickness_list(raw_faces):
+    """The "t" values of raw faces in order, the list thickness ids index into."""
+    return list(itertools.chain.from_iterable(face.get("t", ()) for face in raw_faces))
+
+def corner_face_ids(face_offsets):
+    return np.repeat(np.arange(len(face_offsets) - 1), np.diff(face_offsets))
+
+def thickness_positions(face_offsets, thickness_offsets):
+    """
+    Index into the thickness array for every corner, -1 where a face's "t" list
+    is not one value per corner (those are carried along untouched).
+    """
+    face_ids = corner_face_ids(face_offsets)
+    aligned = (np.diff(thickness_offsets) == np.diff(face_offsets))[face_ids]
+    positions = thickness_offsets[face_ids] + np.arange(len(face_ids)) - face_offsets[face_ids]
+    return np.where(aligned, positions, -1)
+
+def collapse_repeated_corners(face_offsets, face_indices, thickness_offsets, face_thickness):
+    """
+    Removes corners equal to the next corner of the same face (left behind by welding)
+    together with their thickness value.
+    Returns (face_offsets, face_indices, thickness_offsets, face_thickness, reshaped faces mask).
+    """
+    corners, following, face_ids = polygon_edges(face_offsets, face_indices)
+    keep_corner = face_indices[corners] != face_indices[following]
+    t_positions = thickness_positions(face_offsets, thickness_offsets)
+    keep_t = np.ones(len(face_thickness), dtype=bool)
+    keep_t[t_positions[~keep_corner & (t_positions >= 0)]] = False
+
+    face_count = len(face_offsets) - 1
+    sizes = np.bincount(face_ids, weights=keep_corner, minlength=face_count).astype(np.int64)
+    t_sizes = np.bincount(corner_face_ids(thickness_offsets), weights=keep_t, minlength=face_count).astype(np.int64)
+    reshaped = sizes != np.diff(face_offsets)
+    return (np.concatenate(([0], np.cumsum(sizes))), face_indices[keep_corner],
+            np.concatenate(([0], np.cumsum(t_sizes))), face_thickness[keep_t], reshaped)
+
+def pack_raw_mesh(vertices, face_offsets, face_indices, thickness_offsets, thickness_ids,
+                  raw_faces, keep_face, reshaped, raw_vertices=()):
+    """
+    Back to Sprocket's mesh layout: kept faces only, unused vertices dropped. Values
+    are copied from the json wherever they did not change, so an edit never rounds
+    them: the first len(raw_vertices) // 3 vertices come from raw_vertices, the rest
+    from vertices (rounded to 6 decimals). thickness_ids index raw_thickness_list(raw_faces);
+    "t" is only rebuilt for reshaped faces. Every face keeps its other keys from raw_faces.
+    """
+    used = np.zeros(len(vertices), dtype=bool)
+    used[face_indices[keep_face[corner_face_ids(face_offsets)]]] = True
+    face_indices = np.cumsum(used)[face_indices] - 1
+
+    raw_thickness = raw_thickness_list(raw_faces)
+    index_list, id_list = face_indices.tolist(), thickness_ids.tolist()
+    offsets_list, t_offsets_list, reshaped = face_offsets.tolist(), thickness_offsets.tolist(), reshaped.tolist()
+    faces = []
+    for f in np.flatnonzero(keep_face).tolist():
+        face = dict(raw_faces[f])
+        face["v"] = index_list[offsets_list[f]:offsets_list[f + 1]]
+        if "t" in face and reshaped[f]:
+            face["t"] = [raw_thickness[i] for i in id_list[t_offsets_list[f]:t_offsets_list[f + 1]]]
+        faces.append(face)
+
+    kept = np.flatnonzero(used)
+    exact_count = len(raw_vertices) // 3
+    exact, moved = kept[kept < exact_count], kept[kept >= exact_count]
+    vertex_list = []
+    if len(exact):
+        # object array, so the json's own int / float objects are copied as they are
+        originals = np.empty(exact_count * 3, dtype=object)
+        originals[:] = raw_vertices[:exact_count * 3]
+        vertex_list = originals.reshape(-1, 3)[exact].ravel().tolist()
+    vertex_list += np.round(vertices[moved], 6).ravel().tolist()
+    return {"vertices": vertex_list, "faces": faces}
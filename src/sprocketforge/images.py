@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from .assets import get_cache_dir, remove_quietly, temp_path_for
+
+# SETTINGS
+JPEG_QUALITY = 90
+CANCEL_POLL = 0.1       # seconds between checks for a cancel request while encoding
+
+
+def get_image_cache_dir():
+    cache_dir = os.path.join(get_cache_dir(), "images")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def cached_image_path(sha, ext, max_size):
+    size_tag = max_size if max_size else "full"
+    return os.path.join(get_image_cache_dir(), f"{sha}_{size_tag}{ext.lower()}")
+
+def optimize_image(src_path, dst_path, max_size=None):
+    """
+    Re-encodes one image without metadata, downscaled to fit max_size if given.
+    Runs inside a worker process so it only imports PIL there.
+    """
+    from PIL import Image
+
+    tmp_path = temp_path_for(dst_path)
+    try:
+        with Image.open(src_path) as img:
+            img.load()
+            fmt = img.format or "PNG"
+            if max_size and max(img.size) > max_size:
+                img.thumbnail((max_size, max_size), Image.LANCZOS)
+
+            # Pillow writes icc profiles and friends from .info, so only keep transparency
+            transparency = img.info.get("transparency")
+            img.info = {}
+
+            if fmt == "JPEG":
+                img.save(tmp_path, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+            elif transparency is not None:
+                img.save(tmp_path, format=fmt, optimize=True, transparency=transparency)
+            else:
+                img.save(tmp_path, format=fmt, optimize=True)
+
+        os.replace(tmp_path, dst_path)
+    finally:
+        remove_quietly(tmp_path)
+    return dst_path
+
+def optimize_images(sources, max_size=None, workers=None, cancel=None):
+    """
+    Optimizes images in a process pool.
+    `sources` maps source path -> sha256 of its current content (checked against the
+    file's size and mtime, see AssetIndex.file_hash); results are cached by that hash
+    so packing the same assets again costs nothing. Returns {source path: optimized path}
+    for the images where the optimized file actually came out smaller, or {} once
+    `cancel` (a threading.Event) is set.
+    """
+    targets = {}
+    jobs = {}
+    for src_path, sha in sources.items():
+        dst_path = cached_image_path(sha, os.path.splitext(src_path)[1], max_size)
+        targets[src_path] = dst_path
+        if not os.path.exists(dst_path):
+            # identical files share a cache entry, only encode them once
+            jobs.setdefault(dst_path, src_path)
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(optimize_image, src, dst, max_size): dst for dst, src in jobs.items()}
+            pending = set(futures)
+            while pending:
+                if cancel is not None and cancel.is_set():
+                    # images already being encoded finish into the cache, the rest never start
+                    # (by hand, shutdown(cancel_futures=True) needs Python 3.9)
+                    for future in pending:
+                        future.cancel()
+                    return {}
+                done, pending = wait(pending, timeout=CANCEL_POLL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Could not optimize {os.path.basename(jobs[futures[future]])}: {e}")
+
+    smaller = {}
+    for src_path, dst_path in targets.items():
+        if os.path.exists(dst_path) and os.path.getsize(dst_path) < os.path.getsize(src_path):
+            smaller[src_path] = dst_path
+    return smaller
@@ -0,0 +1,120 @@
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# SETTINGS
+MAX_WORKERS = 3
+POLL_MS = 50
+
+
+class Job:
+    """
+    One queued operation. The work function receives the job itself so it can
+    report progress and check `cancel_event` between steps.
+    """
+
+    def __init__(self, scheduler, name, work, on_done, on_progress):
+        self.scheduler = scheduler
+        self.name = name
+        self.work = work
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+        self.status = "queued"
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def report(self, done, total, text=""):
+        """Thread safe; the progress callback runs later on the Tk thread."""
+        self.scheduler.events.put((self, "progress", (done, total, text)))
+
+
+class JobScheduler:
+    """
+    Runs blocking work on a thread pool and hands results back to the Tk thread.
+    Callbacks are only ever called from the Tk main loop, so they may touch widgets.
+    """
+
+    def __init__(self, root, max_workers=MAX_WORKERS):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sprocketforge-job")
+        self.events = queue.Queue()
+        self.active = []
+        self.poll_id = None
+
+    def submit(self, work, name="", on_done=None, on_progress=None):
+        """
+        Queues work(job). on_done(job, result) receives the return value;
+        if work raises, result is the exception instead.
+        """
+        job = Job(self, name, work, on_done, on_progress)
+        self.active.append(job)
+        self.pool.submit(self._run, job)
+        self._schedule_poll()
+        return job
+
+    def _run(self, job):
+        if job.cancelled:
+            self.events.put((job, "done", None))
+            return
+
+        job.status = "running"
+        try:
+            result = job.work(job)
+        except Exception as e:
+            result = e
+        self.events.put((job, "done", result))
+
+    def _schedule_poll(self):
+        if self.poll_id is None:
+            self.poll_id = self.root.after(POLL_MS, self._poll)
+
+    def _call(self, callback, *args):
+        """A broken callback is reported through Tk and must not stop the other jobs."""
+        try:
+            callback(*args)
+        except Exception:
+            self.root.report_callback_exception(*sys.exc_info())
+
+    def _poll(self):
+        self.poll_id = None
+        try:
+            while True:
+                try:
+                    job, kind, payload = self.events.get_nowait()
+                except queue.Empty:
+                    break
+
+                if kind == "progress":
+                    if job.on_progress and not job.cancelled:
+                        self._call(job.on_progress, job, *payload)
+                    continue
+
+                if isinstance(payload, Exception):
+                    job.status = "failed"
+                else:
+                    job.status = "cancelled" if job.cancelled else "done"
+                if job in self.active:
+                    self.active.remove(job)
+                if job.on_done:
+                    self._call(job.on_done, job, payload)
+        finally:
+            if self.active:
+                self._schedule_poll()
+
+    def cancel_all(self):
+        for job in self.active:
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        if self.poll_id is not None:
+            self.root.after_cancel(self.poll_id)
+            self.poll_id = None
+        self.pool.shutdown(wait=False)
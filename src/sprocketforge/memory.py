@@ -0,0 +1,196 @@
+import os
+import sys
+import threading
+
+# SETTINGS
+MEMORY_BUDGET_MB = 2048     # default ceiling for one render on top of what the app already uses
+RAM_HEADROOM = 0.8          # share of the currently free RAM an operation may plan to use
+SAMPLE_INTERVAL = 0.05      # seconds between samples of the live peak tracker
+
+# rough costs, measured with tracemalloc on hulls of 20k to 270k faces
+PARSE_BYTES_PER_FILE_BYTE = 10      # json.load peak, Python objects per byte of .blueprint
+BAKE_BYTES_PER_CORNER = 40          # baked world space arrays (the meshes themselves are parsed by then)
+EDGE_BYTES_PER_CORNER = 230         # FeatureEdges peak while welding and sorting edges
+
+
+class MemoryBudgetError(Exception):
+    pass
+
+
+# SYSTEM MEMORY
+
+def available_memory():
+    """Bytes of RAM other programs are not using right now, or None if it cannot be found out."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+
+    if sys.platform == "win32":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+        return None
+
+    try:
+        with open("/proc/meminfo", 'r') as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def process_memory():
+    """Resident memory of this process in bytes, or None if it cannot be found out."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        # no cheap "current" value on macOS without psutil, the peak is the next best thing
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return None
+
+def format_bytes(n):
+    return f"{n / 2 ** 30:.1f} GB" if n >= 2 ** 30 else f"{n / 2 ** 20:.0f} MB"
+
+
+# GOVERNOR
+
+class MemoryGovernor:
+    """
+    Memory budget for one heavy operation. The limit is the configured budget or
+    the share of free RAM, whichever is smaller. Callers size their work with the
+    estimate_* helpers, and check() stops the operation once the process grows
+    past the limit, before the machine starts swapping. `held` is memory the app
+    already keeps around for such operations (cached blueprints), it counts as used.
+    """
+
+    def __init__(self, budget_mb=None, held=0):
+        budget = (budget_mb or MEMORY_BUDGET_MB) * 2 ** 20
+        available = available_memory()
+        self.limit = min(budget, int(available * RAM_HEADROOM)) if available else budget
+        current = process_memory() or 0
+        self.baseline = max(current - held, 0)
+        self.peak = current
+        self.notes = []
+        self._stop = None
+
+    # ESTIMATES
+
+    @staticmethod
+    def estimate_parse(file_size):
+        return file_size * PARSE_BYTES_PER_FILE_BYTE
+
+    @staticmethod
+    def estimate_bake(corner_count):
+        return corner_count * BAKE_BYTES_PER_CORNER
+
+    @staticmethod
+    def estimate_edges(corner_count):
+        return corner_count * EDGE_BYTES_PER_CORNER
+
+    @staticmethod
+    def estimate_frames(size, frames_count):
+        # one 8-bit canvas and its mask while drawing, 1-bit masks kept (before compression)
+        return size * size * 2 + frames_count * size * size // 8
+
+    def fits(self, needed):
+        """True if needed more bytes still fit on top of what the operation already uses."""
+        current = self.sample()
+        used = current - self.baseline if current is not None else 0
+        return used + needed <= self.limit
+
+    def degrade(self, note):
+        """Records a quality reduction so it can be shown to the user."""
+        self.notes.append(note)
+
+    # LIVE TRACKING
+
+    @property
+    def used(self):
+        """Growth of the process since the governor was created, as of the last sample."""
+        return max(self.peak - self.baseline, 0)
+
+    def sample(self):
+        current = process_memory()
+        if current is not None:
+            self.peak = max(self.peak, current)
+        return current
+
+    def check(self, stage=""):
+        """Raises MemoryBudgetError once the process has grown past the limit."""
+        current = self.sample()
+        if current is not None and current - self.baseline > self.limit:
+            raise MemoryBudgetError(f"Stopped{' while ' + stage if stage else ''}: memory use passed "
+                                    f"the {format_bytes(self.limit)} limit.")
+
+    def start_tracking(self, interval=SAMPLE_INTERVAL):
+        """Samples the process from a background thread, so short spikes count towards the peak."""
+        if self._stop is not None:
+            return
+        self._stop = threading.Event()
+
+        def run(stop):
+            while not stop.wait(interval):
+                self.sample()
+
+        threading.Thread(target=run, args=(self._stop,), daemon=True, name="sprocketforge-memory").start()
+
+    def stop_tracking(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+        self.sample()
+
+    def __enter__(self):
+        self.start_tracking()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_tracking()
+        return False
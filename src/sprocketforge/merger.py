@@ -0,0 +1,203 @@
+import numpy as np
+from .blueprint import Blueprint
+from .edges import WELD_TOLERANCE
+from .geometry import (collapse_repeated_corners, corner_face_ids, face_normals, get_global_matrices,
+                       get_mirror_matrix, pack_raw_mesh, raw_vertex_array, transform_points)
+from .spatial import weld_vertices
+
+
+# MESH HELPERS
+
+def reverse_faces(face_offsets, face_indices):
+    """Flips the winding of every face (needed when a transform mirrors geometry)."""
+    face_ids = corner_face_ids(face_offsets)
+    positions = np.arange(len(face_indices))
+    return face_indices[face_offsets[face_ids] + face_offsets[face_ids + 1] - 1 - positions]
+
+def shared_face_groups(face_offsets, face_indices):
+    """Group id per face (-1 for faces under 3 corners), faces using the same set of corners share a group."""
+    sizes = np.diff(face_offsets)
+    groups = np.full(len(sizes), -1, dtype=np.int64)
+    next_group = 0
+    for k in np.unique(sizes[sizes >= 3]):
+        faces = np.flatnonzero(sizes == k)
+        rows = np.sort(face_indices[face_offsets[faces][:, None] + np.arange(k)], axis=1)
+        _, inverse = np.unique(rows, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        groups[faces] = inverse + next_group
+        next_group += inverse.max() + 1 if len(inverse) else 0
+    return groups
+
+def unshared_faces(groups, normals):
+    """
+    Keeps one face of every group of faces on the same corners, facing the side most
+    of them face. Groups facing both ways equally (the wall between two joined
+    compartments) are dropped entirely. Faces in group -1 are dropped too.
+    """
+    keep = np.zeros(len(groups), dtype=bool)
+    valid = np.flatnonzero(groups >= 0)
+    if len(valid) == 0:
+        return keep
+
+    order = valid[np.argsort(groups[valid], kind="stable")]
+    starts = np.flatnonzero(np.concatenate(([True], groups[order][1:] != groups[order][:-1])))
+    group_index = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(order))))
+
+    # orientation compared against the first face of each group
+    same_side = np.einsum("ij,ij->i", normals[order], normals[order[starts]][group_index]) >= 0
+    balance = np.bincount(group_index, weights=np.where(same_side, 1, -1), minlength=len(starts))
+
+    candidate = (same_side == (balance > 0)[group_index]) & (balance != 0)[group_index]
+    first_candidate = np.unique(group_index[candidate], return_index=True)[1]
+    keep[order[np.flatnonzero(candidate)[first_candidate]]] = True
+    return keep
+
+
+# MERGING
+
+def check_mergeable(model, vuids, global_matrices):
+    """Raises ValueError when the objects cannot become one structure without changing the vehicle."""
+    if len(vuids) < 2:
+        raise ValueError("Select at least two objects to merge.")
+    if len(set(vuids)) != len(vuids):
+        raise ValueError("An object is listed twice.")
+
+    for vuid in vuids:
+        if vuid not in model.objects:
+            raise ValueError(f"No object #{vuid} in this blueprint.")
+        if model.structure_mesh_vuid(model.objects[vuid]) == -1:
+            raise ValueError(f"Object #{vuid} is not a structure.")
+
+    target = model.objects[vuids[0]]
+    users = [o for o in model.objects.values() if o.structure_vuid == target.structure_vuid]
+    if len(users) > 1:
+        raise ValueError(f"The structure of #{target.vuid} is shared with other objects.")
+
+    ancestors = set()
+    parent = target.pvuid
+    while parent in model.objects and parent not in ancestors:
+        ancestors.add(parent)
+        parent = model.objects[parent].pvuid
+
+    for vuid in vuids[1:]:
+        # the target would be left hanging from an object that no longer exists
+        if vuid in ancestors:
+            raise ValueError(f"Object #{vuid} carries #{target.vuid}, list it first instead.")
+        # parts attached to a merged away object would lose their parent
+        if any(child not in vuids for child in model.children.get(vuid, [])):
+            raise ValueError(f"Object #{vuid} has parts attached, list it first or detach them.")
+
+        obj = model.objects[vuid]
+        if obj.is_mirrored != target.is_mirrored:
+            raise ValueError(f"#{vuid} and #{target.vuid} are not both mirrored or both unmirrored.")
+        if target.is_mirrored:
+            # the mirrored copy of the merged mesh has to land where the part's own copy was
+            local = np.linalg.inv(global_matrices[target.vuid]) @ global_matrices[vuid]
+            placed = get_mirror_matrix(target, global_matrices) @ local
+            if not np.allclose(placed, get_mirror_matrix(obj, global_matrices), atol=1e-6):
+                raise ValueError(f"The mirrored copy of #{vuid} would move, merge it without symmetry.")
+
+def merge_structures(model, vuids, tolerance=WELD_TOLERANCE):
+    """
+    Combines the structure meshes of several objects into one mesh in the space of
+    the first object. Coincident vertices are welded with a grid hash, faces that
+    collapse are dropped and walls the parts share are removed (both sides of an
+    interior wall) or kept once (the same face twice). The first object's own
+    vertices and all untouched thickness values are written back exactly.
+    Returns (mesh dict in Sprocket's format, stats dict).
+    """
+    global_matrices = get_global_matrices(model)
+    check_mergeable(model, vuids, global_matrices)
+    to_target = np.linalg.inv(global_matrices[vuids[0]])
+
+    vertices, offsets, indices = [], [np.zeros(1, dtype=np.int64)], []
+    t_offsets, raw_faces = [np.zeros(1, dtype=np.int64)], []
+    target_raw = []
+    vertex_base = index_base = t_base = 0
+
+    for vuid in vuids:
+        mesh = model.mesh(model.structure_mesh_vuid(model.objects[vuid]))
+        if mesh is None:
+            continue
+        raw_mesh = mesh.raw["meshData"]["mesh"]
+        # the target's vertices are already in place, no round trip through its inverse
+        matrix = to_target @ global_matrices[vuid] if vuid != vuids[0] else np.identity(4)
+        face_indices = mesh.face_indices
+        if np.linalg.det(matrix[:3, :3]) < 0:
+            face_indices = reverse_faces(mesh.face_offsets, face_indices)
+
+        if vuid == vuids[0]:
+            target_raw = raw_mesh.get("vertices", [])
+        vertices.append(transform_points(matrix, raw_vertex_array(raw_mesh)))
+        indices.append(face_indices + vertex_base)
+        offsets.append(mesh.face_offsets[1:] + index_base)
+        t_offsets.append(mesh.thickness_offsets[1:] + t_base)
+        raw_faces += raw_mesh.get("faces", [])
+        vertex_base += len(mesh.vertices)
+        index_base += len(mesh.face_indices)
+        t_base += len(mesh.face_thickness)
+
+    vertices = np.concatenate(vertices)
+    face_offsets, face_indices = np.concatenate(offsets), np.concatenate(indices)
+    thickness_offsets = np.concatenate(t_offsets)
+
+    welded, remap = weld_vertices(vertices, tolerance)
+    face_indices = remap[face_indices]
+
+    # welded vertices sit where their lowest original is, so the leading ones are the target's own
+    first_original = np.full(len(welded), len(vertices))
+    np.minimum.at(first_original, remap, np.arange(len(vertices)))
+    exact = first_original[first_original < len(target_raw) // 3]
+    exact_raw = [target_raw[3 * i + axis] for i in exact.tolist() for axis in range(3)]
+
+    # corners welded onto the next corner of the same face disappear, with their thickness
+    face_offsets, face_indices, thickness_offsets, thickness_ids, reshaped = collapse_repeated_corners(
+        face_offsets, face_indices, thickness_offsets, np.arange(t_base))
+    keep_face = np.diff(face_offsets) >= 3
+    degenerate = int((~keep_face).sum())
+
+    # shared walls between the parts
+    valid = int(keep_face.sum())
+    normals = face_normals(welded, face_offsets, face_indices)
+    keep_face = unshared_faces(shared_face_groups(face_offsets, face_indices), normals)
+    shared = valid - int(keep_face.sum())
+
+    mesh = pack_raw_mesh(welded, face_offsets, face_indices, thickness_offsets, thickness_ids,
+                         raw_faces, keep_face, reshaped, exact_raw)
+    stats = {
+        "vertices_before": len(vertices),
+        "vertices": len(mesh["vertices"]) // 3,
+        "faces": len(mesh["faces"]),
+        "degenerate_faces": degenerate,
+        "shared_faces": shared,
+    }
+    return mesh, stats
+
+def merge_compartments(data, vuids, tolerance=WELD_TOLERANCE):
+    """
+    Merges the listed objects into the first one, in place on the blueprint json.
+    The other objects and the blueprints and meshes only they used are removed.
+    Returns a short description of what happened.
+    """
+    model = Blueprint(data)
+    mesh, stats = merge_structures(model, vuids, tolerance)
+
+    target = model.objects[vuids[0]]
+    target_mesh = model.raw_meshes[model.structure_mesh_vuid(target)]
+    target_mesh["meshData"]["mesh"].update(mesh)
+
+    removed = set(vuids[1:])
+    data["objects"] = [o for o in data["objects"] if o["vuid"] not in removed]
+
+    used_blueprints = {o.get("structureBlueprintVuid") for o in data["objects"]}
+    orphans = {model.objects[v].structure_vuid for v in removed} - used_blueprints
+    orphan_meshes = {model.blueprints[b].body_mesh_vuid for b in orphans if b in model.blueprints}
+    data["blueprints"] = [bp for bp in data.get("blueprints", []) if bp.get("id") not in orphans]
+
+    used_meshes = {bp.get("blueprint", {}).get("bodyMeshVuid") for bp in data["blueprints"]}
+    data["meshes"] = [m for m in data.get("meshes", [])
+                      if m["vuid"] not in orphan_meshes or m["vuid"] in used_meshes]
+
+    return (f"Merged {len(vuids)} compartments into #{target.vuid}: "
+            f"{stats['vertices_before']} -> {stats['vertices']} vertices, "
+            f"{stats['shared_faces']} shared and {stats['degenerate_faces']} collapsed faces removed")
@@ -0,0 +1,263 @@
+import math
+import os
+import zlib
+import numpy as np
+import cv2
+from PIL import Image, ImageOps
+from .blueprint import blueprint_cache_bytes, is_blueprint_cached, load_blueprint, trim_blueprint_cache
+from .edges import CREASE_ANGLE, FeatureEdges
+from .geometry import bake_mesh_arrays
+from .memory import MemoryBudgetError, MemoryGovernor, format_bytes
+
+# SETTINGS
+TARGET_FACE_COUNT = 15000 
+RENDER_SIZE = 800
+MIN_RENDER_SIZE = 300       # the memory governor does not go below these
+MIN_FRAMES_COUNT = 12
+# RGB, the lines used to be drawn as BGR (100, 200, 255) and swapped afterwards
+WIREFRAME_COLOR = (255, 200, 100)
+
+# FRAME STORAGE
+
+class FrameSet:
+    """
+    Wireframe frames stored as 1-bit masks (packed 8 pixels per byte and zlib
+    compressed, the lines are sparse). Frames are only colorized when shown, so a
+    full turn costs a few MB instead of size * size * 3 bytes per frame.
+    """
+
+    def __init__(self, size, color=WIREFRAME_COLOR):
+        self.size = size
+        self.color = color
+        self.masks = []
+        # filled in by generate_render_frames
+        self.notes = []
+        self.peak_memory = 0
+
+    def append(self, mask):
+        packed = np.packbits(mask, axis=1)
+        self.masks.append(zlib.compress(packed.tobytes(), 1))
+
+    def __getitem__(self, idx):
+        # PIL's "1" mode uses the exact layout np.packbits produces
+        bits = Image.frombytes("1", (self.size, self.size), zlib.decompress(self.masks[idx]))
+        return ImageOps.colorize(bits.convert("L"), black=(0, 0, 0), white=self.color)
+
+    def __len__(self):
+        return len(self.masks)
+
+    def clear(self):
+        self.masks.clear()
+
+
+class StreamedFrameSet(FrameSet):
+    """
+    Frames drawn when they are shown. Without keep only the most recent frame is
+    cached, for renders too large to store; with keep every drawn frame is stored
+    like in FrameSet, so a new render shows up at once and fills in while it spins.
+    """
+
+    def __init__(self, size, frames_count, draw, color=WIREFRAME_COLOR, keep=False):
+        super().__init__(size, color)
+        self.frames_count = frames_count
+        self.draw = draw
+        self.keep = keep
+        self.stored = {}
+        self.last = (None, None)
+
+    def append(self, mask):
+        raise TypeError("streamed frames are drawn on demand")
+
+    def mask(self, idx):
+        if idx in self.stored:
+            packed = np.frombuffer(zlib.decompress(self.stored[idx]), dtype=np.uint8)
+            return np.unpackbits(packed.reshape(self.size, -1), axis=1, count=self.size).astype(bool)
+        if self.last[0] != idx:
+            self.last = (idx, self.draw(idx))
+            if self.keep:
+                self.stored[idx] = zlib.compress(np.packbits(self.last[1], axis=1).tobytes(), 1)
+        return self.last[1]
+
+    def __getitem__(self, idx):
+        gray = Image.fromarray(self.mask(idx).astype(np.uint8) * 255, "L")
+        return ImageOps.colorize(gray, black=(0, 0, 0), white=self.color)
+
+    def __len__(self):
+        return self.frames_count
+
+    def clear(self):
+        # drops the geometry the draw function holds on to
+        self.frames_count = 0
+        self.draw = None
+        self.stored.clear()
+        self.last = (None, None)
+
+
+# MEMORY PLANNING
+
+def baked_corner_count(model):
+    """Corners of the baked scene, known from the mesh sizes before baking (mirrored parts count twice)."""
+    total = 0
+    for obj in model.objects.values():
+        mesh_id = model.structure_mesh_vuid(obj)
+        mesh = model.mesh(mesh_id) if mesh_id != -1 else None
+        if mesh is not None and len(mesh.vertices):
+            total += len(mesh.face_indices) * (2 if obj.is_mirrored else 1)
+    return total
+
+def render_estimate(governor, corner_count, size, frames_count, feature_edges, stream=False):
+    edges = governor.estimate_edges(corner_count) if feature_edges else 0
+    return governor.estimate_bake(corner_count) + edges + governor.estimate_frames(size, 0 if stream else frames_count)
+
+def plan_render(governor, corner_count, size, frames_count, feature_edges):
+    """
+    Fits a render into the governor's limit by giving up quality one step at a time:
+    the outline (its edge analysis is the largest cost) for the decimated wireframe,
+    then frames, then keeping frames (they get drawn on demand), then resolution.
+    Returns (size, frames_count, feature_edges, stream).
+    """
+    stream = False
+
+    def needed():
+        return render_estimate(governor, corner_count, size, frames_count, feature_edges, stream)
+
+    if feature_edges and not governor.fits(needed()):
+        feature_edges = False
+        governor.degrade("full wireframe instead of outline")
+
+    if not governor.fits(needed()) and frames_count > MIN_FRAMES_COUNT:
+        while not governor.fits(needed()) and frames_count > MIN_FRAMES_COUNT:
+            frames_count = max(frames_count // 2, MIN_FRAMES_COUNT)
+        governor.degrade(f"{frames_count} frames")
+
+    if not governor.fits(needed()):
+        stream = True
+        governor.degrade("frames drawn on demand")
+
+    if not governor.fits(needed()) and size > MIN_RENDER_SIZE:
+        while not governor.fits(needed()) and size > MIN_RENDER_SIZE:
+            size = max(int(size * 0.75), MIN_RENDER_SIZE)
+        governor.degrade(f"{size} px")
+
+    if not governor.fits(needed()):
+        raise MemoryBudgetError(f"This blueprint needs about {format_bytes(needed())} to display, "
+                                f"the limit is {format_bytes(governor.limit)}.")
+
+    return size, frames_count, feature_edges, stream
+
+def generate_render_frames(filepath, size=600, frames_count=60, feature_edges=True, crease_angle=CREASE_ANGLE,
+                           memory_budget=None, scene=None, lazy=False):
+    """
+    Renders a turntable of wireframe frames. With feature_edges only creases, open
+    borders and the silhouette are drawn instead of every triangulation edge.
+    The render is fitted into memory_budget (MB, see memory.py) and the available
+    RAM, frames.notes lists whatever had to be reduced for that.
+    With a SceneCache only the parts that changed since its last update are baked
+    again, with lazy the frames are drawn when first shown.
+    """
+    # blueprints cached for other pages count as used, and give way before the render loses quality
+    governor = MemoryGovernor(memory_budget, held=blueprint_cache_bytes())
+
+    if not is_blueprint_cached(filepath):
+        parsing = governor.estimate_parse(os.path.getsize(filepath))
+        if not governor.fits(parsing):
+            trim_blueprint_cache(keep=filepath)
+        if not governor.fits(parsing):
+            raise MemoryBudgetError(f"Opening this blueprint needs about {format_bytes(parsing)}, "
+                                    f"the limit is {format_bytes(governor.limit)}.")
+
+    with governor:
+        try:
+            model = load_blueprint(filepath)
+        except Exception as e:
+            print(f"Error loading file: {e}")
+            return FrameSet(size)
+
+        corner_count = baked_corner_count(model)
+        if not governor.fits(render_estimate(governor, corner_count, size, frames_count, feature_edges)):
+            trim_blueprint_cache(keep=filepath)
+        size, frames_count, feature_edges, stream = plan_render(
+            governor, corner_count, size, frames_count, feature_edges)
+        governor.check("loading")
+
+        if scene is not None:
+            all_vertices, face_offsets, face_indices = scene.update(model)
+        else:
+            all_vertices, face_offsets, face_indices = bake_mesh_arrays(model)
+        governor.check("baking")
+
+        if len(all_vertices) == 0:
+            return FrameSet(size)
+
+        min_vals = np.min(all_vertices, axis=0)
+        max_vals = np.max(all_vertices, axis=0)
+        center = (min_vals + max_vals) / 2
+        dims = max_vals - min_vals
+        max_dim = np.max(dims)
+        if max_dim == 0: max_dim = 1
+
+        padding = size * 0.2
+        scale_factor = (size - padding) / max_dim
+
+        if feature_edges:
+            edges = FeatureEdges(all_vertices, face_offsets, face_indices, crease_angle)
+        else:
+            face_count = len(face_offsets) - 1
+            stride = 1
+            if face_count > TARGET_FACE_COUNT:
+                stride = int(face_count / TARGET_FACE_COUNT)
+            optimized_faces = [face_indices[face_offsets[f]:face_offsets[f + 1]] for f in range(0, face_count, stride)]
+        governor.check("preparing edges")
+
+        def draw(i):
+            img = np.zeros((size, size), dtype=np.uint8)
+
+            angle = (i / frames_count) * 2 * math.pi
+
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            tilt = math.radians(20)
+            cos_t, sin_t = math.cos(tilt), math.sin(tilt)
+
+            rot_y = np.array([
+                [cos_a, 0, sin_a],
+                [0, 1, 0],
+                [-sin_a, 0, cos_a]
+            ])
+
+            rot_x = np.array([
+                [1, 0, 0],
+                [0, cos_t, -sin_t],
+                [0, sin_t, cos_t]
+            ])
+
+            cam_mat = np.dot(rot_x, rot_y)
+
+            v_centered = all_vertices - center
+            v_rotated = np.dot(v_centered, cam_mat.T)
+
+            sx = (v_rotated[:, 0] * scale_factor) + (size / 2)
+            sy = (size / 2) - (v_rotated[:, 1] * scale_factor)
+
+            pts_cache = np.column_stack((sx, sy)).astype(np.int32)
+
+            if feature_edges:
+                # the camera looks down the rotated z axis
+                segments = pts_cache[edges.visible_edges(cam_mat[2])]
+                cv2.polylines(img, segments, False, 255, 1)
+            else:
+                polygons = [pts_cache[face].reshape((-1, 1, 2)) for face in optimized_faces]
+                cv2.polylines(img, polygons, True, 255, 1)
+
+            return img > 0
+
+        if stream or lazy:
+            frames = StreamedFrameSet(size, frames_count, draw, keep=not stream)
+        else:
+            frames = FrameSet(size)
+            for i in range(frames_count):
+                frames.append(draw(i))
+                governor.check("rendering")
+
+    frames.notes = governor.notes
+    frames.peak_memory = governor.used
+    return frames
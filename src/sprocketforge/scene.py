@@ -0,0 +1,126 @@
+import hashlib
+import json
+import numpy as np
+from .geometry import get_global_matrices, get_mirror_matrix, transform_points
+
+
+def entry_hash(raw):
+    """Hash of one json entry (object, blueprint), independent of key order."""
+    return hashlib.sha1(json.dumps(raw, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+def mesh_hash(mesh):
+    """Hash of the geometry of a MeshRecord. Thickness is left out, it does not change the baked shape."""
+    h = hashlib.sha1()
+    for array in (mesh.vertices, mesh.face_offsets, mesh.face_indices):
+        h.update(array.tobytes())
+    return h.hexdigest()
+
+
+class SceneCache:
+    """
+    Baked scene kept between reloads of the same blueprint. update() compares the
+    new model with the previous one entry by entry and only recomputes matrices
+    and baked vertices for the pvuid subtrees below objects that changed, and for
+    objects whose structure or mesh changed. The result matches bake_mesh_arrays.
+    """
+
+    def __init__(self):
+        self.object_hashes = {}
+        self.blueprint_hashes = {}
+        self.mesh_hashes = {}
+        self.children = {}
+        self.matrices = {}
+        # vuid -> [(world vertices, face_offsets, face_indices)], mirrored copy second
+        self.instances = {}
+        self.rebaked = 0
+
+    def changed_objects(self, model, object_hashes, blueprint_hashes, mesh_hashes):
+        """Returns (objects whose matrix is stale, objects whose baked geometry is stale)."""
+        moved = set()
+        for vuid, h in object_hashes.items():
+            if self.object_hashes.get(vuid) != h:
+                moved.update(model.descendants(vuid))
+
+        # children of removed objects now hang somewhere else
+        for vuid in self.object_hashes.keys() - object_hashes.keys():
+            for child in self.children.get(vuid, []):
+                if child in model.objects:
+                    moved.update(model.descendants(child))
+
+        rebake = set(moved)
+        for vuid, obj in model.objects.items():
+            bp_id = obj.structure_vuid
+            if self.blueprint_hashes.get(bp_id) != blueprint_hashes.get(bp_id):
+                rebake.add(vuid)
+            mesh_id = model.structure_mesh_vuid(obj)
+            if mesh_id != -1 and self.mesh_hashes.get(mesh_id) != mesh_hashes.get(mesh_id):
+                rebake.add(vuid)
+        return moved, rebake
+
+    def update_matrices(self, model, moved):
+        for vuid in moved:
+            self.matrices.pop(vuid, None)
+        get_global_matrices(model, self.matrices)
+
+    def bake_object(self, model, vuid):
+        obj = model.objects[vuid]
+        mesh_id = model.structure_mesh_vuid(obj)
+        mesh = model.mesh(mesh_id) if mesh_id != -1 else None
+        if mesh is None or len(mesh.vertices) == 0:
+            return []
+
+        matrices = [self.matrices[vuid]]
+        if obj.is_mirrored:
+            matrices.append(get_mirror_matrix(obj, self.matrices))
+
+        vertices = mesh.vertices.astype(np.float64)
+        return [(transform_points(matrix, vertices), mesh.face_offsets, mesh.face_indices) for matrix in matrices]
+
+    def update(self, model):
+        """
+        Brings the cache up to date with model.
+        Returns (vertices (N, 3), face_offsets, face_indices) of the whole scene.
+        """
+        object_hashes = {vuid: entry_hash(obj.raw) for vuid, obj in model.objects.items()}
+        blueprint_hashes = {bp_id: entry_hash(bp.raw) for bp_id, bp in model.blueprints.items()}
+        mesh_hashes = {}
+        for obj in model.objects.values():
+            mesh_id = model.structure_mesh_vuid(obj)
+            if mesh_id != -1 and mesh_id not in mesh_hashes and model.mesh(mesh_id) is not None:
+                mesh_hashes[mesh_id] = mesh_hash(model.mesh(mesh_id))
+
+        moved, rebake = self.changed_objects(model, object_hashes, blueprint_hashes, mesh_hashes)
+
+        for vuid in self.object_hashes.keys() - object_hashes.keys():
+            self.matrices.pop(vuid, None)
+            self.instances.pop(vuid, None)
+        self.update_matrices(model, moved)
+        for vuid in rebake:
+            self.instances[vuid] = self.bake_object(model, vuid)
+
+        self.object_hashes = object_hashes
+        self.blueprint_hashes = blueprint_hashes
+        self.mesh_hashes = mesh_hashes
+        self.children = {pvuid: list(children) for pvuid, children in model.children.items()}
+        self.rebaked = len(rebake)
+        return self.assemble(model)
+
+    def assemble(self, model):
+        """Concatenates the cached instances in bake_mesh_arrays order."""
+        baked_vertices = []
+        baked_offsets = [np.zeros(1, dtype=np.int64)]
+        baked_indices = []
+        vertex_offset = 0
+        index_offset = 0
+
+        for vuid in model.objects:
+            for vertices, face_offsets, face_indices in self.instances.get(vuid, []):
+                baked_vertices.append(vertices)
+                baked_offsets.append(face_offsets[1:] + index_offset)
+                baked_indices.append(face_indices + vertex_offset)
+                vertex_offset += len(vertices)
+                index_offset += len(face_indices)
+
+        if not baked_vertices:
+            return np.zeros((0, 3)), baked_offsets[0], np.zeros(0, dtype=np.int64)
+        return np.concatenate(baked_vertices), np.concatenate(baked_offsets), np.concatenate(baked_indices)
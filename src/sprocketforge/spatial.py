@@ -0,0 +1,125 @@
+import numpy as np
+
+# SETTINGS
+MAX_CELLS_PER_AXIS = 1 << 20
+# cells a few times larger than the tolerance mean only points close to a cell
+# border need to look at the neighbouring cell
+CELL_SCALE = 4
+
+# the cell itself plus half of its 26 neighbours, so every cell pair is visited once
+HALF_NEIGHBOURHOOD = np.array([(0, 0, 0)] + [
+    (x, y, z)
+    for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)
+    if (x, y, z) > (0, 0, 0)
+], dtype=np.int64)
+
+
+def close_pairs(points, tolerance):
+    """
+    Every pair of points (i < j) closer than tolerance, found with a uniform grid
+    hash. Only points in the same or neighbouring cells are compared, so the cost
+    grows with the number of points, not their square.
+    Returns two index arrays.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # cells may be larger than the tolerance, never smaller
+    extent = float((points.max(axis=0) - points.min(axis=0)).max())
+    cell_size = max(tolerance * CELL_SCALE, extent / (MAX_CELLS_PER_AXIS - 3), 1e-12)
+
+    scaled = (points - points.min(axis=0)) / cell_size
+    cells = np.floor(scaled).astype(np.int64) + 1
+    # where each point sits inside its cell, to skip neighbours it cannot reach
+    frac = scaled - (cells - 1)
+    margin = tolerance / cell_size
+    near = {1: frac >= 1 - margin, -1: frac <= margin}
+    dims = cells.max(axis=0) + 2
+    strides = np.array([dims[1] * dims[2], dims[2], 1], dtype=np.int64)
+    keys = cells @ strides
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    cell_starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+    cell_keys = sorted_keys[cell_starts]
+    cell_counts = np.diff(np.append(cell_starts, len(keys)))
+    point_cell = np.empty(len(points), dtype=np.int64)
+    point_cell[order] = np.repeat(np.arange(len(cell_keys)), cell_counts)
+
+    first, second = [], []
+    for offset in HALF_NEIGHBOURHOOD:
+        if offset.any():
+            reaches = np.ones(len(points), dtype=bool)
+            for axis, step in enumerate(offset):
+                if step:
+                    reaches &= near[step][:, axis]
+            marked = np.zeros(len(cell_keys), dtype=bool)
+            marked[point_cell[reaches]] = True
+            candidates = np.flatnonzero(marked)
+        else:
+            candidates = np.arange(len(cell_keys))
+
+        neighbour_keys = cell_keys[candidates] + offset @ strides
+        pos = np.searchsorted(cell_keys, neighbour_keys)
+        pos[pos == len(cell_keys)] = 0
+        found = cell_keys[pos] == neighbour_keys
+
+        a_cells = candidates[found]
+        b_cells = pos[found]
+        a_counts, b_counts = cell_counts[a_cells], cell_counts[b_cells]
+        pair_counts = a_counts * b_counts
+        if pair_counts.sum() == 0:
+            continue
+
+        # expand every cell pair into all of its point pairs
+        pair_cell = np.repeat(np.arange(len(a_cells)), pair_counts)
+        local = np.arange(len(pair_cell)) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        ia = local // b_counts[pair_cell]
+        ib = local % b_counts[pair_cell]
+        if not offset.any():
+            keep = ia < ib
+            pair_cell, ia, ib = pair_cell[keep], ia[keep], ib[keep]
+
+        first.append(order[cell_starts[a_cells][pair_cell] + ia])
+        second.append(order[cell_starts[b_cells][pair_cell] + ib])
+
+    if not first:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    i, j = np.concatenate(first), np.concatenate(second)
+    close = np.einsum("ij,ij->i", points[i] - points[j], points[i] - points[j]) <= tolerance * tolerance
+    i, j = i[close], j[close]
+    return np.minimum(i, j), np.maximum(i, j)
+
+def connected_labels(count, i, j):
+    """Smallest member index of the group every element ends up in when pairs (i, j) are joined."""
+    labels = np.arange(count)
+    while len(i):
+        low = np.minimum(labels[i], labels[j])
+        if np.array_equal(low, labels[i]) and np.array_equal(low, labels[j]):
+            break
+        np.minimum.at(labels, i, low)
+        np.minimum.at(labels, j, low)
+        # pointer jumping so long chains collapse in a few rounds
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return labels
+
+def weld_vertices(points, tolerance):
+    """
+    Merges points closer than tolerance (transitively).
+    Returns (welded points, remap) where remap[old index] is the new index.
+    """
+    points = np.asarray(points)
+    if tolerance <= 0:
+        welded, remap = np.unique(points, axis=0, return_inverse=True)
+        return welded, remap.ravel()
+
+    i, j = close_pairs(points, tolerance)
+    labels = connected_labels(len(points), i, j)
+    representatives, remap = np.unique(labels, return_inverse=True)
+    return points[representatives], remap.ravel()
@@ -0,0 +1,252 @@
+import argparse
+import json
+import numpy as np
+from .blueprint import Blueprint, MeshRecord, load_blueprint
+from .edges import WELD_TOLERANCE
+from .geometry import (collapse_repeated_corners, corner_face_ids, face_normals, pack_raw_mesh, polygon_edges,
+                       raw_thickness_list, raw_vertex_array)
+from .spatial import close_pairs, connected_labels
+
+# SETTINGS
+AREA_EPSILON = 1e-10        # m^2, faces smaller than this are degenerate
+SAMPLE_SIZE = 10            # face / vertex indices listed per issue
+
+# check: (severity, what the indices point at, description)
+CHECKS = {
+    "unreadable": ("error", "mesh", "mesh data could not be read"),
+    "missing_mesh": ("error", "mesh", "structure uses a mesh that does not exist"),
+    "non_finite": ("error", "vertices", "vertices with NaN or infinite coordinates"),
+    "out_of_range": ("error", "faces", "faces with corner indices outside the vertex list"),
+    "too_few_corners": ("error", "faces", "faces with fewer than 3 corners"),
+    "thickness_mismatch": ("error", "faces", "faces with a thickness list not matching their corners"),
+    "bad_thickness": ("error", "faces", "faces with a NaN, infinite or negative thickness"),
+    "repeated_corners": ("warning", "faces", "faces using the same vertex twice in a row"),
+    "zero_area": ("warning", "faces", "faces with (almost) no area"),
+    "duplicate_vertices": ("warning", "vertices", "vertices on top of another vertex"),
+}
+
+
+# CHECKS
+
+def read_mesh(raw):
+    """MeshRecord of a raw mesh entry, or None when the data is malformed beyond reading."""
+    try:
+        return MeshRecord(raw)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def duplicate_groups(vertices, finite, tolerance):
+    """For every vertex the lowest index it would be welded onto (itself if none)."""
+    remap = np.arange(len(vertices))
+    if tolerance > 0 and finite.any():
+        finite_ids = np.flatnonzero(finite)
+        i, j = close_pairs(vertices[finite_ids], tolerance)
+        remap[finite_ids] = finite_ids[connected_labels(len(finite_ids), i, j)]
+    return remap
+
+def check_mesh(mesh, tolerance=WELD_TOLERANCE):
+    """
+    Runs every check on one mesh with whole-array operations.
+    Returns {check: offending face or vertex indices}, only checks that found something.
+    """
+    vertices = mesh.vertices.astype(np.float64)
+    offsets, indices = mesh.face_offsets, mesh.face_indices
+    sizes = np.diff(offsets)
+    corners, following, face_ids = polygon_edges(offsets, indices)
+
+    finite = np.isfinite(vertices).all(axis=1)
+    in_range = (indices >= 0) & (indices < len(vertices))
+    safe = np.where(in_range, indices, 0)
+    usable_corner = in_range & finite[safe]
+    usable = (np.bincount(face_ids, weights=~usable_corner, minlength=mesh.face_count) == 0) & (sizes >= 3)
+
+    t_face_ids = corner_face_ids(mesh.thickness_offsets)
+    bad_t = ~np.isfinite(mesh.face_thickness) | (mesh.face_thickness < 0)
+
+    positions = np.where(finite[:, None], vertices, 0)
+    areas = np.linalg.norm(face_normals(positions, offsets, safe), axis=1) / 2
+
+    found = {
+        "non_finite": np.flatnonzero(~finite),
+        "out_of_range": np.unique(face_ids[~in_range]),
+        "too_few_corners": np.flatnonzero(sizes < 3),
+        "thickness_mismatch": np.flatnonzero((np.diff(mesh.thickness_offsets) != sizes) & (sizes > 0)),
+        "bad_thickness": np.unique(t_face_ids[bad_t]),
+        "repeated_corners": np.unique(face_ids[in_range & (safe[corners] == safe[following])]),
+        "zero_area": np.flatnonzero(usable & (areas < AREA_EPSILON)),
+        "duplicate_vertices": np.flatnonzero(duplicate_groups(vertices, finite, tolerance) != np.arange(len(vertices))),
+    }
+    return {check: ids for check, ids in found.items() if len(ids)}
+
+def issue(mesh_vuid, check, ids=()):
+    severity, kind, _ = CHECKS[check]
+    return {"mesh": mesh_vuid, "check": check, "severity": severity, "kind": kind,
+            "count": max(len(ids), 1), "sample": [int(i) for i in ids[:SAMPLE_SIZE]]}
+
+def validate_blueprint(model, tolerance=WELD_TOLERANCE):
+    """
+    Checks every mesh of a Blueprint model.
+    Returns a report dict: totals plus a list of issues, each with the mesh vuid, the
+    check's name and severity, how many faces / vertices are affected and a sample.
+    """
+    report = {"meshes": 0, "faces": 0, "vertices": 0, "errors": 0, "warnings": 0, "issues": []}
+
+    for obj in model.objects.values():
+        mesh_vuid = model.structure_mesh_vuid(obj)
+        if mesh_vuid != -1 and mesh_vuid not in model.raw_meshes:
+            report["issues"].append(issue(mesh_vuid, "missing_mesh"))
+
+    for mesh_vuid, raw in model.raw_meshes.items():
+        try:
+            mesh = model.mesh(mesh_vuid)
+        except (KeyError, TypeError, ValueError):
+            mesh = None
+        if mesh is None:
+            report["issues"].append(issue(mesh_vuid, "unreadable"))
+            continue
+
+        report["meshes"] += 1
+        report["faces"] += mesh.face_count
+        report["vertices"] += len(mesh.vertices)
+        for check, ids in check_mesh(mesh, tolerance).items():
+            report["issues"].append(issue(mesh_vuid, check, ids))
+
+    for entry in report["issues"]:
+        report["errors" if entry["severity"] == "error" else "warnings"] += 1
+    return report
+
+
+# REPAIR
+
+def fix_thickness(faces, fallback):
+    """Pads or trims "t" lists to one value per corner and replaces unusable values."""
+    fixed = 0
+    for face in faces:
+        t = face.get("t")
+        if t is None:
+            continue
+        clean = [x for x in t if isinstance(x, (int, float)) and np.isfinite(x) and x >= 0]
+        if len(clean) == len(t) == len(face["v"]):
+            continue
+        fill = clean[-1] if clean else fallback
+        face["t"] = (clean + [fill] * len(face["v"]))[:len(face["v"])]
+        fixed += 1
+    return fixed
+
+def repair_mesh(mesh, tolerance=WELD_TOLERANCE):
+    """
+    Fixes what check_mesh finds: welds duplicate vertices, drops faces that are broken,
+    collapsed or without area, repairs thickness lists and removes unused vertices.
+    Vertices and thickness values that are kept come out exactly as they were.
+    Returns (mesh dict in Sprocket's format, {fix: count}).
+    """
+    raw_mesh = mesh.raw["meshData"]["mesh"]
+    raw_faces = raw_mesh.get("faces", [])
+    vertices = raw_vertex_array(raw_mesh)
+    offsets, indices = mesh.face_offsets, mesh.face_indices
+    _, _, face_ids = polygon_edges(offsets, indices)
+
+    finite = np.isfinite(vertices).all(axis=1)
+    in_range = (indices >= 0) & (indices < len(vertices))
+    safe = np.where(in_range, indices, 0)
+    broken = np.bincount(face_ids, weights=~(in_range & finite[safe]), minlength=mesh.face_count) > 0
+
+    remap = duplicate_groups(vertices, finite, tolerance)
+    welded = int((remap != np.arange(len(vertices))).sum())
+
+    offsets, indices, t_offsets, t_ids, reshaped = collapse_repeated_corners(
+        offsets, remap[safe], mesh.thickness_offsets, np.arange(len(mesh.face_thickness)))
+    areas = np.linalg.norm(face_normals(np.where(finite[:, None], vertices, 0), offsets, indices), axis=1) / 2
+    collapsed = ~broken & (np.diff(offsets) < 3)
+    flat = ~broken & ~collapsed & (areas < AREA_EPSILON)
+    keep = ~(broken | collapsed | flat)
+
+    repaired = pack_raw_mesh(vertices, offsets, indices, t_offsets, t_ids, raw_faces, keep, reshaped,
+                             raw_mesh.get("vertices", []))
+
+    thickness = np.array(raw_thickness_list(raw_faces), dtype=np.float64)[t_ids]
+    usable_t = thickness[np.isfinite(thickness) & (thickness >= 0)]
+    fallback = float(np.median(usable_t)) if len(usable_t) else 5.0
+    fixes = {
+        "welded_vertices": welded,
+        "removed_broken_faces": int(broken.sum()),
+        "removed_collapsed_faces": int(collapsed.sum()),
+        "removed_zero_area_faces": int(flat.sum()),
+        "fixed_thickness": fix_thickness(repaired["faces"], fallback),
+        "removed_vertices": len(vertices) - len(repaired["vertices"]) // 3,
+    }
+    return repaired, fixes
+
+def repair_blueprint(data, tolerance=WELD_TOLERANCE):
+    """
+    Repairs every mesh with issues, in place on the blueprint json. Unreadable
+    meshes are left alone. Returns {mesh vuid: fixes} for the meshes that changed.
+    """
+    model = Blueprint(data)
+    changed = {}
+    for mesh_vuid, raw in model.raw_meshes.items():
+        mesh = read_mesh(raw)
+        if mesh is None or not check_mesh(mesh, tolerance):
+            continue
+        repaired, fixes = repair_mesh(mesh, tolerance)
+        raw["meshData"]["mesh"].update(repaired)
+        changed[mesh_vuid] = fixes
+    return changed
+
+
+# REPORTS
+
+def format_report(report, title=""):
+    lines = [title] if title else []
+    lines.append(f"{report['meshes']} meshes, {report['faces']:,} faces, {report['vertices']:,} vertices: "
+                 f"{report['errors']} error(s), {report['warnings']} warning(s)")
+    for entry in report["issues"]:
+        _, kind, description = CHECKS[entry["check"]]
+        count = f"{entry['count']} " if kind != "mesh" else ""
+        sample = f" (e.g. {', '.join(map(str, entry['sample']))})" if entry["sample"] else ""
+        lines.append(f"  {entry['severity']}: mesh #{entry['mesh']}: {count}{description}{sample}")
+    return "\n".join(lines)
+
+def format_repairs(changed):
+    if not changed:
+        return "Nothing to repair."
+    lines = []
+    for mesh_vuid, fixes in changed.items():
+        done = ", ".join(f"{count} {fix.replace('_', ' ')}" for fix, count in fixes.items() if count)
+        lines.append(f"mesh #{mesh_vuid}: {done or 'no changes'}")
+    return "\n".join(lines)
+
+def validate_blueprint_file(filepath, tolerance=WELD_TOLERANCE):
+    return validate_blueprint(load_blueprint(filepath), tolerance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checks the meshes of a Sprocket blueprint for broken geometry.")
+    parser.add_argument("blueprint")
+    parser.add_argument("--tolerance", type=float, default=WELD_TOLERANCE,
+                        help="vertices closer than this (m) count as duplicates, 0 turns the check off")
+    parser.add_argument("--repair", metavar="OUT", help="write a repaired copy of the blueprint to OUT")
+    parser.add_argument("--json", action="store_true", help="print machine readable output")
+    args = parser.parse_args()
+
+    report = validate_blueprint_file(args.blueprint, args.tolerance)
+    changed = None
+    if args.repair:
+        with open(args.blueprint, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        changed = repair_blueprint(data, args.tolerance)
+        with open(args.repair, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4)
+
+    if args.json:
+        print(json.dumps({"report": report, "repairs": changed}, indent=4))
+        return
+
+    print(format_report(report))
+    if changed is not None:
+        print()
+        print(format_repairs(changed))
+
+
+if __name__ == "__main__":
+    main()
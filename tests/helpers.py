@@ -0,0 +1,32 @@
+import numpy as np
+
+# corner i of a box sits at the bits of i: x = 1, y = 2, z = 4
+BOX_FACES = [[0, 2, 3, 1], [4, 5, 7, 6], [0, 1, 5, 4], [2, 6, 7, 3], [0, 4, 6, 2], [1, 3, 7, 5]]
+
+
+def box_mesh(vuid, size=1.0, thickness=10):
+    """Unit box as a raw mesh entry: 8 shared vertices and 6 outward facing quads."""
+    vertices = [size * float((i >> axis) & 1) for i in range(8) for axis in range(3)]
+    faces = [{"v": list(face), "t": [thickness] * 4} for face in BOX_FACES]
+    return {"vuid": vuid, "meshData": {"mesh": {"vertices": vertices, "faces": faces}}}
+
+def structure(vuid, bp_id, pos=(0, 0, 0), rot=(0, 0, 0), scale=(1, 1, 1), pvuid=-1, flags=0):
+    return {"vuid": vuid, "pvuid": pvuid, "flags": flags, "structureBlueprintVuid": bp_id,
+            "transform": {"pos": list(pos), "rot": list(rot), "scale": list(scale), "mirrorVuid": -1}}
+
+def structure_blueprint(bp_id, mesh_vuid):
+    return {"id": bp_id, "type": "structure", "blueprint": {"bodyMeshVuid": mesh_vuid}}
+
+def blueprint_data(objects, meshes):
+    """Blueprint json where object i uses blueprint 10 + i and that one uses meshes[i]."""
+    return {
+        "objects": objects,
+        "blueprints": [structure_blueprint(o["structureBlueprintVuid"], m["vuid"]) for o, m in zip(objects, meshes)],
+        "meshes": meshes,
+    }
+
+def brute_force_pairs(points, tolerance):
+    diff = points[:, None, :] - points[None, :, :]
+    i, j = np.nonzero(np.einsum("ijk,ijk->ij", diff, diff) <= tolerance * tolerance)
+    keep = i < j
+    return set(zip(i[keep].tolist(), j[keep].tolist()))
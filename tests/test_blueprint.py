@@ -0,0 +1,49 @@
+import json
+import pytest
+from sprocketforge import blueprint
+from sprocketforge.blueprint import Blueprint, blueprint_cache_bytes, load_blueprint, trim_blueprint_cache
+from helpers import blueprint_data, box_mesh, structure
+
+
+@pytest.fixture
+def blueprint_file(tmp_path):
+    def write(name, mesh_count=1):
+        data = blueprint_data([structure(i, 10 + i) for i in range(mesh_count)],
+                              [box_mesh(100 + i) for i in range(mesh_count)])
+        path = tmp_path / name
+        path.write_text(json.dumps(data))
+        return str(path)
+    trim_blueprint_cache()
+    yield write
+    trim_blueprint_cache()
+
+def test_read_only_model_frees_json_of_built_meshes_only():
+    data = blueprint_data([structure(1, 10), structure(2, 11)], [box_mesh(100), box_mesh(101)])
+    model = Blueprint(data, read_only=True)
+    model.mesh(100)
+    assert "meshData" not in data["meshes"][0]
+    assert "meshData" in data["meshes"][1]
+    assert model.mesh(100).raw is None and len(model.mesh(100).vertices) == 8
+
+def test_editable_model_keeps_json():
+    data = blueprint_data([structure(1, 10)], [box_mesh(100)])
+    model = Blueprint(data)
+    assert model.mesh(100).raw is data["meshes"][0]
+
+def test_load_blueprint_is_cached_and_lazy(blueprint_file):
+    path = blueprint_file("a.blueprint")
+    model = load_blueprint(path)
+    assert load_blueprint(path) is model
+    assert model._meshes == {}
+    before = blueprint_cache_bytes()
+    model.mesh(100)
+    assert 0 < blueprint_cache_bytes() < before
+
+def test_cache_is_bounded_by_bytes(blueprint_file, monkeypatch):
+    first, second = blueprint_file("a.blueprint", 3), blueprint_file("b.blueprint", 3)
+    one = load_blueprint(first).estimated_bytes()
+    monkeypatch.setattr(blueprint, "SESSION_CACHE_MB", one * 1.5 / 2 ** 20)
+
+    load_blueprint(second)
+    assert not blueprint.is_blueprint_cached(first)
+    assert blueprint.is_blueprint_cached(second)
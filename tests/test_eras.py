@@ -0,0 +1,80 @@
+import os
+import pytest
+from sprocketforge import functions
+from sprocketforge.functions import generate_era_batch, write_files_atomic
+
+ERA = {"era_name": "Coldwar", "start_date": "1945.09.03", "med_mass": "18000", "heavy_mass": "36000",
+       "torque_coeff": "0.85", "tech_factor": "0.8", "pressure": "40000", "penetrator": "1900",
+       "calibre": "100", "propellant": "360", "max_seg": "20", "min_seg": "1", "resistance": "0.5",
+       "max_torque": "100", "run_torque": "50", "max_gears": "8", "track_res": "0.1"}
+
+
+def era(name):
+    return dict(ERA, era_name=name)
+
+def written_files(root):
+    return sorted(os.path.relpath(os.path.join(folder, name), root)
+                  for folder, _, names in os.walk(root) for name in names)
+
+def test_batch_writes_seven_files_per_era(tmp_path):
+    success, msg = generate_era_batch([era("Early"), era("Late")], str(tmp_path))
+    assert success, msg
+    files = written_files(tmp_path)
+    assert len(files) == 14
+    assert os.path.join("Sprocket_Data", "StreamingAssets", "Eras", "Late.json") in files
+
+    # a second run finds nothing to do
+    assert generate_era_batch([era("Early"), era("Late")], str(tmp_path)) == \
+        (True, "Success! 2 era(s): 0 file(s) written, 14 unchanged.")
+
+@pytest.mark.parametrize("name", ["", "   ", "../../evil", "a/b", "a\\b", "C:evil", "bad..name", "trailing."])
+def test_unsafe_era_names_are_refused(tmp_path, name):
+    success, msg = generate_era_batch([era("Fine"), era(name)], str(tmp_path))
+    assert not success
+    assert "row 2" in msg
+    assert written_files(tmp_path) == []
+
+def test_era_names_differing_in_case_are_duplicates(tmp_path):
+    success, msg = generate_era_batch([era("Late"), era("late")], str(tmp_path))
+    assert not success
+    assert "same era name as row 1" in msg
+    assert written_files(tmp_path) == []
+
+def test_invalid_number_is_reported_per_row(tmp_path):
+    success, msg = generate_era_batch([era("Fine"), dict(era("Broken"), calibre="big")], str(tmp_path))
+    assert not success
+    assert "row 2 (Broken)" in msg
+
+@pytest.mark.parametrize("failing_call", range(1, 6))
+def test_write_files_atomic_rolls_back(tmp_path, monkeypatch, failing_call):
+    a, b, c = (str(tmp_path / name) for name in "abc")
+    write_files_atomic({a: "A1", b: "B1"})
+
+    real_replace = os.replace
+    calls = []
+
+    def locked(src, dst):
+        calls.append(dst)
+        if len(calls) == failing_call:
+            raise PermissionError("file is locked")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(functions.os, "replace", locked)
+    with pytest.raises(PermissionError):
+        write_files_atomic({a: "A2", b: "B2", c: "C2"})
+    monkeypatch.undo()
+
+    assert sorted(os.listdir(tmp_path)) == ["a", "b"]
+    assert [open(p).read() for p in (a, b)] == ["A1", "B1"]
+
+def test_write_files_atomic_cleans_up_failed_write(tmp_path, monkeypatch):
+    a, b = str(tmp_path / "a"), str(tmp_path / "b")
+
+    def cancel(progress, cancel, done, total, text=""):
+        if done == 1:
+            raise functions.OperationCancelled()
+
+    monkeypatch.setattr(functions, "step", cancel)
+    with pytest.raises(functions.OperationCancelled):
+        write_files_atomic({a: "A", b: "B"})
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,35 @@
+import os
+import threading
+import pytest
+from sprocketforge import images
+from sprocketforge.images import optimize_images
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    folder = tmp_path / "cache"
+    folder.mkdir()
+    monkeypatch.setattr(images, "get_image_cache_dir", lambda: str(folder))
+    return folder
+
+def noisy_png(path, seed):
+    Image.effect_noise((256, 256), 20 + seed).convert("RGB").save(path, optimize=False, compress_level=0)
+    return str(path)
+
+def test_optimize_images_caches_by_hash(tmp_path, cache_dir):
+    src = noisy_png(tmp_path / "a.png", 0)
+    result = optimize_images({src: "abc"}, max_size=64, workers=1)
+    assert result == {src: os.path.join(str(cache_dir), "abc_64.png")}
+    with Image.open(result[src]) as img:
+        assert max(img.size) == 64
+    assert [p for p in os.listdir(cache_dir) if p.endswith(".tmp")] == []
+
+def test_optimize_images_stops_on_cancel(tmp_path, cache_dir):
+    sources = {noisy_png(tmp_path / f"{i}.png", i): f"sha{i}" for i in range(8)}
+    cancel = threading.Event()
+    cancel.set()
+    assert optimize_images(sources, workers=1, cancel=cancel) == {}
+    # only images already handed to the worker (one running, one queued) are encoded
+    assert len(os.listdir(cache_dir)) <= 2
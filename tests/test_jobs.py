@@ -0,0 +1,54 @@
+import threading
+from sprocketforge.jobs import JobScheduler
+
+
+class FakeRoot:
+    """Stands in for Tk: after() queues the callback, pump() runs it."""
+
+    def __init__(self):
+        self.pending = []
+        self.errors = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+        return len(self.pending)
+
+    def after_cancel(self, poll_id):
+        pass
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.errors.append(exc)
+
+    def pump(self, timeout=5.0):
+        while self.pending:
+            callbacks, self.pending = self.pending, []
+            for callback in callbacks:
+                callback()
+            threading.Event().wait(0.01)
+            timeout -= 0.01
+            assert timeout > 0, "jobs never finished"
+
+
+def test_failing_callback_does_not_stop_polling():
+    root = FakeRoot()
+    scheduler = JobScheduler(root, max_workers=2)
+    release = threading.Event()
+    results = []
+
+    def broken(job, result):
+        raise RuntimeError("widget is gone")
+
+    scheduler.submit(lambda job: 1, on_done=broken)
+    scheduler.submit(lambda job: release.wait(5) and 2, on_done=lambda job, result: results.append(result))
+
+    while scheduler.events.empty():
+        threading.Event().wait(0.01)
+    root.pending.pop()()
+    assert root.errors
+    assert root.pending, "polling stopped while a job was still running"
+    release.set()
+    root.pump()
+    scheduler.shutdown()
+
+    assert results == [2]
+    assert [str(e) for e in root.errors] == ["widget is gone"]
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from sprocketforge.blueprint import Blueprint
+from sprocketforge.geometry import face_normals
+from sprocketforge.merger import merge_compartments, merge_structures
+from helpers import blueprint_data, box_mesh, structure
+
+
+def two_boxes(**second):
+    return blueprint_data([structure(1, 10), structure(2, 11, pos=(1, 0, 0), **second)],
+                          [box_mesh(100, thickness=10), box_mesh(101, thickness=20)])
+
+def test_box_faces_point_outwards():
+    mesh = Blueprint(two_boxes()).mesh(100)
+    normals = face_normals(mesh.vertices.astype(np.float64), mesh.face_offsets, mesh.face_indices)
+    centres = np.add.reduceat(mesh.vertices[mesh.face_indices], mesh.face_offsets[:-1]) / 4
+    assert (np.einsum("ij,ij->i", normals, centres - 0.5) > 0).all()
+
+def test_merge_adjacent_boxes():
+    mesh, stats = merge_structures(Blueprint(two_boxes()), [1, 2])
+
+    assert stats["vertices_before"] == 16
+    assert stats["vertices"] == 12
+    assert stats["faces"] == 10
+    assert stats["shared_faces"] == 2
+    assert len(mesh["vertices"]) == 36
+
+    # the wall at x = 1 is gone, every face keeps the thickness of the box it came from
+    vertices = np.array(mesh["vertices"]).reshape(-1, 3)
+    thickness = {}
+    for face in mesh["faces"]:
+        corners = vertices[face["v"]]
+        assert not np.allclose(corners[:, 0], 1)
+        side = "first" if corners[:, 0].max() <= 1 else "second"
+        thickness.setdefault(side, set()).update(face["t"])
+    assert thickness == {"first": {10}, "second": {20}}
+
+def test_merge_compartments_removes_merged_parts():
+    data = two_boxes()
+    msg = merge_compartments(data, [1, 2])
+
+    assert "16 -> 12 vertices" in msg
+    assert [o["vuid"] for o in data["objects"]] == [1]
+    assert [bp["id"] for bp in data["blueprints"]] == [10]
+    assert [m["vuid"] for m in data["meshes"]] == [100]
+    assert len(data["meshes"][0]["meshData"]["mesh"]["faces"]) == 10
+
+def test_merge_refuses_mixed_symmetry():
+    with pytest.raises(ValueError, match="mirrored"):
+        merge_structures(Blueprint(two_boxes(flags=4)), [1, 2])
+
+def test_merge_refuses_parts_with_children():
+    data = two_boxes()
+    data["objects"].append(structure(3, 12, pvuid=2))
+    data["blueprints"].append({"id": 12, "type": "structure", "blueprint": {"bodyMeshVuid": 100}})
+    with pytest.raises(ValueError, match="parts attached"):
+        merge_structures(Blueprint(data), [1, 2])
+
+def test_merge_refuses_ancestor_of_target():
+    data = blueprint_data([structure(1, 10, pos=(5, 0, 0)), structure(2, 11, pos=(1, 0, 0), pvuid=1)],
+                          [box_mesh(100), box_mesh(101)])
+    with pytest.raises(ValueError, match="carries"):
+        merge_compartments(data, [2, 1])
+    assert [o["vuid"] for o in data["objects"]] == [1, 2]
+
+    # the other way round the child is merged into its parent
+    merge_compartments(data, [1, 2])
+    assert [o["vuid"] for o in data["objects"]] == [1]
+
+def test_merge_keeps_target_values_exact():
+    data = two_boxes()
+    first = data["meshes"][0]["meshData"]["mesh"]
+    first["vertices"][0] = 1e-7             # corner 0 is not shared with the second box
+    first["vertices"][1] = 0.1234567891
+    first["faces"][4]["t"] = [0.30000000000000004, 1, 2, 3]
+
+    merge_compartments(data, [1, 2])
+    merged = data["meshes"][0]["meshData"]["mesh"]
+    assert merged["vertices"][:3] == [1e-7, 0.1234567891, 0]
+    assert [0.30000000000000004, 1, 2, 3] in [face["t"] for face in merged["faces"]]
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import zipfile
+import pytest
+from sprocketforge.functions import MANIFEST_NAME, pack_blueprints_for_sharing, unpack_package
+from helpers import blueprint_data, box_mesh, structure
+
+
+@pytest.fixture
+def sprocket_dir(tmp_path, monkeypatch):
+    """A Sprocket folder with one blueprint using a decal (saved with different case) and a missing paint."""
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "appdata"))
+    root = tmp_path / "Sprocket"
+    for folder in ("Decals", "Paint"):
+        (root / folder).mkdir(parents=True)
+    (root / "Decals" / "star.png").write_bytes(b"red star")
+
+    data = blueprint_data([structure(1, 10)], [box_mesh(100)])
+    data["blueprints"] += [
+        {"id": 20, "type": "decal", "blueprint": {"imageURL": "C:\\Users\\x\\Decals\\Star.PNG"}},
+        {"id": 21, "type": "paintJob", "blueprint": {"colourMapUrl": "camo.png"}},
+    ]
+    (root / "tank.blueprint").write_text(json.dumps(data))
+    return root
+
+def pack(root, name="package.zip", **options):
+    zip_path = str(root / name)
+    success, msg = pack_blueprints_for_sharing([str(root / "tank.blueprint")], str(root), zip_path=zip_path, **options)
+    assert success, msg
+    return zip_path, msg
+
+def read_manifest(zip_path):
+    with zipfile.ZipFile(zip_path) as zipf:
+        return json.loads(zipf.read(MANIFEST_NAME))
+
+def test_missing_assets_are_recorded_not_printed(sprocket_dir, tmp_path, capsys):
+    zip_path, msg = pack(sprocket_dir)
+    assert capsys.readouterr().out == ""
+    assert "1 missing asset(s): camo.png" in msg
+
+    manifest = read_manifest(zip_path)
+    assert manifest["missing"] == [{"kind": "paint", "name": "camo.png"}]
+    assert sorted(manifest["files"]) == ["decals/star.png", "vehicles/tank.blueprint"]
+
+    success, msg = unpack_package(zip_path, str(tmp_path / "out"))
+    assert success and "packed without 1 missing asset(s): camo.png" in msg
+
+def write_package(zip_path, files, manifest):
+    with zipfile.ZipFile(zip_path, 'w') as zipf:
+        for arcname, blob in files.items():
+            zipf.writestr(arcname, blob)
+        zipf.writestr(MANIFEST_NAME, json.dumps(manifest))
+
+@pytest.mark.parametrize("arcname", ["../evil.txt", "vehicles/../../evil.txt", "..\\evil.txt",
+                                     "C:evil.txt", "/tmp/evil.txt", "vehicles//evil.txt"])
+def test_unsafe_names_are_rejected(tmp_path, arcname):
+    blob = b"evil"
+    zip_path = str(tmp_path / "evil.zip")
+    write_package(zip_path, {arcname: blob}, {"files": {arcname: hashlib.sha256(blob).hexdigest()}})
+
+    success, msg = unpack_package(zip_path, str(tmp_path / "out"))
+    assert not success and "unsafe path" in msg
+    assert not (tmp_path / "out").exists() and not (tmp_path / "evil.txt").exists()
+
+def test_tampered_blob_is_rejected(sprocket_dir, tmp_path):
+    zip_path, _ = pack(sprocket_dir)
+    with zipfile.ZipFile(zip_path) as zipf:
+        files = {name: zipf.read(name) for name in zipf.namelist() if name != MANIFEST_NAME}
+    files["decals/star.png"] = b"blue star"
+    write_package(zip_path, files, read_manifest(zip_path))
+
+    success, msg = unpack_package(zip_path, str(tmp_path / "out"))
+    assert not success and "hash mismatch for decals/star.png" in msg
+    assert not (tmp_path / "out").exists()
+
+def test_delta_needs_the_unchanged_base_files(sprocket_dir, tmp_path):
+    full_path, _ = pack(sprocket_dir)
+    out = tmp_path / "out"
+    assert unpack_package(full_path, str(out))[0]
+
+    data = json.loads((sprocket_dir / "tank.blueprint").read_text())
+    data["meshes"] = [box_mesh(100, size=2.0)]
+    (sprocket_dir / "tank.blueprint").write_text(json.dumps(data))
+    delta_path, msg = pack(sprocket_dir, "delta.zip", previous=full_path)
+    assert "1 of 2 files changed" in msg
+
+    success, msg = unpack_package(delta_path, str(tmp_path / "empty"))
+    assert not success and "base file missing or different: decals/star.png" in msg
+
+    (out / "decals" / "star.png").write_bytes(b"green star")
+    success, msg = unpack_package(delta_path, str(out))
+    assert not success and "base file missing or different: decals/star.png" in msg
+
+    (out / "decals" / "star.png").write_bytes(b"red star")
+    success, msg = unpack_package(delta_path, str(out))
+    assert success, msg
+    assert (out / "vehicles" / "tank.blueprint").read_text() == (sprocket_dir / "tank.blueprint").read_text()
+
+def test_delta_deletes_removed_vehicles_it_can_verify(sprocket_dir, tmp_path):
+    data = blueprint_data([structure(1, 10)], [box_mesh(300)])
+    (sprocket_dir / "scout.blueprint").write_text(json.dumps(data))
+    (sprocket_dir / "tug.blueprint").write_text(json.dumps(data))
+    vehicles = [str(sprocket_dir / f"{name}.blueprint") for name in ("tank", "scout", "tug")]
+    full_path = str(sprocket_dir / "full.zip")
+    assert pack_blueprints_for_sharing(vehicles, str(sprocket_dir), zip_path=full_path)[0]
+    out = tmp_path / "out"
+    assert unpack_package(full_path, str(out))[0]
+    (out / "vehicles" / "tug.blueprint").write_text("edited by hand")
+
+    delta_path = str(sprocket_dir / "delta.zip")
+    (sprocket_dir / "Decals" / "star.png").unlink()
+    assert pack_blueprints_for_sharing(vehicles[:1], str(sprocket_dir), zip_path=delta_path, previous=full_path)[0]
+    assert sorted(read_manifest(delta_path)["removed"]) == ["decals/star.png", "vehicles/scout.blueprint",
+                                                             "vehicles/tug.blueprint"]
+
+    success, msg = unpack_package(delta_path, str(out))
+    assert success, msg
+    assert "deleted 1 vehicle(s)" in msg and "2 file(s) no longer in the package were left in place" in msg
+    assert not (out / "vehicles" / "scout.blueprint").exists()
+    assert (out / "vehicles" / "tug.blueprint").read_text() == "edited by hand"
+    assert (out / "decals" / "star.png").exists()
@@ -0,0 +1,90 @@
+import copy
+import numpy as np
+import pytest
+from sprocketforge.blueprint import Blueprint
+from sprocketforge.geometry import bake_mesh_arrays
+from sprocketforge.scene import SceneCache
+from helpers import blueprint_data, box_mesh, structure
+
+
+def vehicle():
+    objects = [
+        structure(1, 10, pos=(0, 1, 0), scale=(2, 1, 1)),
+        structure(2, 11, pos=(1, 0, 0.5), rot=(0, 30, 0), pvuid=1, flags=4),
+        structure(3, 12, pos=(0, 0.5, 0), rot=(10, 0, 20), pvuid=2),
+        structure(4, 13, pos=(-3, 0, 0)),
+    ]
+    meshes = [box_mesh(100), box_mesh(101, size=0.5), box_mesh(102, size=0.25), box_mesh(103, size=2)]
+    return blueprint_data(objects, meshes)
+
+def find(data, vuid):
+    return next(o for o in data["objects"] if o["vuid"] == vuid)
+
+def move_root(data):
+    find(data, 1)["transform"]["pos"] = [0, 2, 0]
+
+def move_leaf(data):
+    find(data, 4)["transform"]["rot"] = [0, 90, 0]
+
+def remove_middle(data):
+    data["objects"].remove(find(data, 2))
+
+def reparent(data):
+    find(data, 3)["pvuid"] = 4
+
+def unmirror(data):
+    find(data, 2)["flags"] = 0
+
+def edit_mesh(data):
+    data["meshes"][1]["meshData"]["mesh"]["vertices"][0] = -0.25
+
+def swap_mesh(data):
+    data["blueprints"][0]["blueprint"]["bodyMeshVuid"] = 103
+
+def add_object(data):
+    data["objects"].append(structure(5, 10, pos=(0, 0, 4), pvuid=3))
+
+def assert_matches_bake(cache, data):
+    model = Blueprint(data)
+    vertices, offsets, indices = cache.update(model)
+    expected = bake_mesh_arrays(model)
+    assert np.allclose(vertices, expected[0])
+    assert np.array_equal(offsets, expected[1])
+    assert np.array_equal(indices, expected[2])
+
+@pytest.mark.parametrize("change", [move_root, move_leaf, remove_middle, reparent, unmirror,
+                                    edit_mesh, swap_mesh, add_object])
+def test_update_matches_full_bake(change):
+    data = vehicle()
+    cache = SceneCache()
+    assert_matches_bake(cache, data)
+
+    changed = copy.deepcopy(data)
+    change(changed)
+    assert_matches_bake(cache, changed)
+    # and back again
+    assert_matches_bake(cache, data)
+
+def test_changes_in_a_row():
+    data = vehicle()
+    cache = SceneCache()
+    for change in (move_root, reparent, edit_mesh, remove_middle, add_object):
+        change(data)
+        assert_matches_bake(cache, data)
+
+def test_only_changed_subtree_is_rebaked():
+    data = vehicle()
+    cache = SceneCache()
+    cache.update(Blueprint(data))
+    assert cache.rebaked == 4
+
+    cache.update(Blueprint(copy.deepcopy(data)))
+    assert cache.rebaked == 0
+
+    move_leaf(data)
+    cache.update(Blueprint(data))
+    assert cache.rebaked == 1
+
+    reparent(data)
+    cache.update(Blueprint(data))
+    assert cache.rebaked == 1
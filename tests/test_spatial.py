@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from sprocketforge.spatial import close_pairs, connected_labels, weld_vertices
+from helpers import brute_force_pairs
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_close_pairs_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    tolerance = 0.05
+    centres = rng.uniform(-1, 1, (40, 3))
+    # clusters around random centres plus scattered points, so many pairs straddle cell borders
+    points = np.concatenate([centres[rng.integers(0, 40, 300)] + rng.normal(0, tolerance, (300, 3)),
+                             rng.uniform(-1, 1, (200, 3))])
+
+    i, j = close_pairs(points, tolerance)
+    found = list(zip(i.tolist(), j.tolist()))
+    assert len(found) == len(set(found))
+    assert set(found) == brute_force_pairs(points, tolerance)
+
+def test_close_pairs_across_cell_borders():
+    tolerance = 1e-4
+    # on both sides of the coordinates a grid of tolerance sized buckets would split at
+    xs = np.array([0.49999e-4, 0.50001e-4, 3.99999e-4, 4.00001e-4, 1.0])
+    points = np.column_stack((xs, np.zeros(5), np.zeros(5)))
+    i, j = close_pairs(points, tolerance)
+    assert set(zip(i.tolist(), j.tolist())) == brute_force_pairs(points, tolerance)
+    assert (0, 1) in set(zip(i.tolist(), j.tolist()))
+
+def test_close_pairs_few_points():
+    for points in (np.zeros((0, 3)), np.zeros((1, 3))):
+        i, j = close_pairs(points, 0.1)
+        assert len(i) == len(j) == 0
+
+def test_connected_labels_chain():
+    # 0-1, 1-2, 2-3 in reverse order plus a separate pair
+    labels = connected_labels(6, np.array([2, 1, 0, 4]), np.array([3, 2, 1, 5]))
+    assert labels.tolist() == [0, 0, 0, 0, 4, 4]
+
+def test_weld_vertices_is_transitive():
+    points = np.array([[0, 0, 0], [0.8e-4, 0, 0], [1.6e-4, 0, 0], [1, 0, 0]], dtype=np.float64)
+    welded, remap = weld_vertices(points, 1e-4)
+    assert len(welded) == 2
+    assert remap.tolist() == [0, 0, 0, 1]
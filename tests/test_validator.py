@@ -0,0 +1,83 @@
+import json
+import math
+import numpy as np
+from sprocketforge.blueprint import Blueprint
+from sprocketforge.validator import CHECKS, repair_blueprint, validate_blueprint
+from helpers import blueprint_data, box_mesh, structure
+
+
+def broken_box():
+    """A box with one instance of every problem the validator knows (except a missing mesh)."""
+    raw = box_mesh(100)
+    mesh = raw["meshData"]["mesh"]
+    mesh["vertices"] += [0.5, 0, 0,                 # 8: on the edge 0-1
+                         1, 1, 1 + 1e-6,            # 9: on top of 7
+                         math.nan, 0, 0]            # 10: not a number
+    faces = mesh["faces"]
+    faces[0]["t"] = [-1, 10, 10, 10]
+    faces[1]["t"] = [10, 10]
+    faces[2] = {"v": [0, 1, 1, 5, 4], "t": [10] * 5}
+    faces[3]["v"] = [2, 6, 9, 3]
+    faces += [{"v": [0, 1], "t": [10, 10]},
+              {"v": [0, 1, 99], "t": [10] * 3},
+              {"v": [0, 8, 1], "t": [10] * 3},
+              {"v": [10, 0, 1], "t": [10] * 3}]
+    return blueprint_data([structure(1, 10)], [raw])
+
+def found_checks(data):
+    return {entry["check"] for entry in validate_blueprint(Blueprint(data))["issues"]}
+
+def test_clean_box_passes():
+    data = blueprint_data([structure(1, 10)], [box_mesh(100)])
+    report = validate_blueprint(Blueprint(data))
+    assert report["issues"] == []
+    assert (report["meshes"], report["faces"], report["vertices"]) == (1, 6, 8)
+    assert repair_blueprint(data) == {}
+
+def test_every_check_is_found():
+    expected = set(CHECKS) - {"unreadable", "missing_mesh"}
+    assert found_checks(broken_box()) == expected
+
+def test_missing_mesh():
+    data = blueprint_data([structure(1, 10)], [box_mesh(100)])
+    data["meshes"] = []
+    report = validate_blueprint(Blueprint(data))
+    assert [entry["check"] for entry in report["issues"]] == ["missing_mesh"]
+    assert report["errors"] == 1
+
+def test_repair_round_trip():
+    data = broken_box()
+    changed = repair_blueprint(data)
+
+    fixes = changed[100]
+    assert fixes["welded_vertices"] == 1
+    assert fixes["removed_broken_faces"] == 2
+    assert fixes["removed_collapsed_faces"] == 1
+    assert fixes["removed_zero_area_faces"] == 1
+    assert fixes["fixed_thickness"] == 2
+
+    # the repaired blueprint survives a save and is clean from then on
+    data = json.loads(json.dumps(data))
+    assert found_checks(data) == set()
+    assert repair_blueprint(data) == {}
+
+    mesh = Blueprint(data).mesh(100)
+    assert (mesh.face_count, len(mesh.vertices)) == (6, 8)
+    assert np.array_equal(mesh.face_sizes, [4] * 6)
+    assert np.array_equal(np.diff(mesh.thickness_offsets), mesh.face_sizes)
+    assert (mesh.face_thickness >= 0).all()
+
+def test_repair_keeps_untouched_values_exact():
+    data = blueprint_data([structure(1, 10)], [box_mesh(100)])
+    mesh = data["meshes"][0]["meshData"]["mesh"]
+    mesh["vertices"][21] = 123.4567895      # x of vertex 7, not representable in float32
+    mesh["faces"][0]["t"] = [0.1234567891, 7]
+    mesh["faces"][1]["t"] = [0.30000000000000004] * 4
+    before = json.dumps(mesh["vertices"])
+
+    assert repair_blueprint(data) == {100: {"welded_vertices": 0, "removed_broken_faces": 0,
+                                            "removed_collapsed_faces": 0, "removed_zero_area_faces": 0,
+                                            "fixed_thickness": 1, "removed_vertices": 0}}
+    assert json.dumps(mesh["vertices"]) == before
+    assert mesh["faces"][0]["t"] == [0.1234567891, 7, 7, 7]
+    assert mesh["faces"][1]["t"] == [0.30000000000000004] * 4